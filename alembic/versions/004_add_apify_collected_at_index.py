@@ -0,0 +1,24 @@
+"""Index apify_scraped_data by collection time
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Hashtag discovery scans recent posts by collected_at
+    op.create_index('idx_apify_collected_at', 'apify_scraped_data', ['collected_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_apify_collected_at', table_name='apify_scraped_data')
@@ -0,0 +1,35 @@
+"""Make data_source_monitoring unique per source
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the newest record of any duplicated source before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM data_source_monitoring older
+        USING data_source_monitoring newer
+        WHERE older.source_type = newer.source_type
+          AND older.source_name = newer.source_name
+          AND older.id < newer.id
+        """
+    )
+
+    # record_fetch_attempt upserts on (source_type, source_name)
+    op.create_index('idx_source_type_name', 'data_source_monitoring', ['source_type', 'source_name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_source_type_name', table_name='data_source_monitoring')
@@ -0,0 +1,28 @@
+"""Index apify_scraped_data hashtags for containment lookups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # hashtags is a json column, which GIN can't index directly; hashtag
+    # engagement lookups query CAST(hashtags AS JSONB) @> '["tag"]'
+    op.execute(
+        "CREATE INDEX idx_apify_hashtags_gin ON apify_scraped_data "
+        "USING gin ((hashtags::jsonb) jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_apify_hashtags_gin', table_name='apify_scraped_data')
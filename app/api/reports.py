@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from redis.exceptions import RedisError
 from app.database import get_db
+from app.redis_client import get_redis, report_progress_key
 from app.api.auth import get_current_user_optional
 from app.models import User, Report
 from app.schemas import (
@@ -14,6 +16,20 @@ from datetime import datetime, timedelta
 router = APIRouter()
 
 
+async def _get_live_progress(report: Report) -> int:
+    """Report progress, preferring the worker's in-flight value in Redis"""
+    if report.status in ("completed", "failed"):
+        return report.progress
+
+    try:
+        redis = await get_redis()
+        progress = await redis.get(report_progress_key(report.id))
+    except RedisError:
+        progress = None
+
+    return int(progress) if progress is not None else report.progress
+
+
 @router.post("/generate", response_model=GenerateReportResponse)
 async def generate_report(
     request: GenerateReportRequest,
@@ -77,7 +93,7 @@ async def get_report_status(
         data={
             "report_id": report.id,
             "status": report.status,
-            "progress": report.progress,
+            "progress": await _get_live_progress(report),
             "estimated_completion": report.estimated_completion,
             "completed_at": report.completed_at,
             "download_url": report.download_url
@@ -85,6 +101,34 @@ async def get_report_status(
     )
 
 
+@router.get("/{report_id}/progress", response_model=BaseResponse)
+async def get_report_progress(
+    report_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_optional)
+):
+    """Get report generation progress (updated live by the worker via Redis)"""
+    result = await db.execute(
+        select(Report).where(
+            Report.id == report_id,
+            Report.user_id == current_user.id
+        )
+    )
+    report = result.scalar_one_or_none()
+
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    return BaseResponse(
+        success=True,
+        data={
+            "report_id": report.id,
+            "status": report.status,
+            "progress": await _get_live_progress(report)
+        }
+    )
+
+
 @router.get("/", response_model=BaseResponse)
 async def list_reports(
     db: AsyncSession = Depends(get_db),
@@ -4,6 +4,7 @@ Unified endpoints for all social media data sources
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, Integer
 from pydantic import BaseModel, Field
@@ -16,12 +17,13 @@ from app.models import User
 from app.models.social_media_sources import ApifyScrapedData
 from app.services.google_trends_service import get_google_trends_service
 from app.services.tiktok_service import get_tiktok_service
-from app.services.facebook_service import get_facebook_service
+from app.services.facebook_service import get_facebook_service, POSTS_PER_PAGE
 from app.services.apify_service import get_apify_service
 from app.services.data_pipeline_service import get_data_pipeline_service
 from app.services.hashtag_discovery_service import get_hashtag_discovery_service
 from app.services.geocoding_service import get_geocoding_service
 from app.schemas import BaseResponse
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,7 +37,7 @@ router = APIRouter()
 
 class GoogleTrendsRequest(BaseModel):
     """Request model for Google Trends"""
-    keywords: Optional[List[str]] = Field(None, description="Keywords to analyze (max 5)")
+    keywords: Optional[List[str]] = Field(None, description="Keywords to analyze")
     timeframe: str = Field(default="today 3-m", description="Time period (e.g., 'today 3-m', 'today 12-m')")
     include_related: bool = Field(default=True, description="Include related queries")
     include_regional: bool = Field(default=True, description="Include regional interest")
@@ -139,6 +141,25 @@ async def analyze_keywords(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/trends/interest/stream")
+async def stream_interest_over_time(
+    keywords: List[str] = Query(..., description="Keywords to track"),
+    timeframe: str = Query(default="today 3-m", description="Time period (e.g., 'today 3-m')"),
+    geo: str = Query(default="NG", description="Region code (NG for Nigeria)"),
+    current_user: User = Depends(get_current_user_optional)
+):
+    """
+    Stream interest over time as NDJSON, one data point per line
+    """
+    trends_service = get_google_trends_service()
+    points = trends_service.aiter_interest_over_time(keywords, timeframe=timeframe, geo=geo)
+
+    return StreamingResponse(
+        (orjson.dumps(point) + b"\n" async for point in points),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/trends/suggestions")
 async def get_keyword_suggestions(
     keyword: str = Query(..., description="Partial keyword"),
@@ -292,8 +313,8 @@ async def scrape_facebook_page(
         facebook_service = get_facebook_service()
 
         posts = await facebook_service.scrape_page_posts(
-            page_name=request.page_name,
-            pages=request.pages
+            page_url=request.page_name,
+            posts_limit=request.pages * POSTS_PER_PAGE
         )
 
         # Store in database
@@ -337,7 +358,7 @@ async def monitor_nigerian_facebook(
         facebook_service = get_facebook_service()
 
         result = await facebook_service.monitor_nigerian_pages(
-            pages_per_source=pages_per_source
+            posts_per_page=pages_per_source * POSTS_PER_PAGE
         )
 
         # Store in background
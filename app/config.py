@@ -54,6 +54,12 @@ class Settings(BaseSettings):
     TIKTOK_API_KEY: Optional[str] = Field(default=None)
     TIKTOK_API_SECRET: Optional[str] = Field(default=None)
     TIKTOK_ACCESS_TOKEN: Optional[str] = Field(default=None)
+    # Max TikTok hashtags searched concurrently during monitoring
+    TIKTOK_MONITOR_CONCURRENCY: int = Field(default=4)
+    # How long TikTok results are served from Redis; TikTok content shifts on
+    # an hourly scale, so results can be up to this many seconds stale
+    TIKTOK_CACHE_TTL_TRENDING: int = Field(default=900)
+    TIKTOK_CACHE_TTL_ANALYTICS: int = Field(default=3600)
 
     # Facebook/Instagram API Configuration
     FACEBOOK_APP_ID: Optional[str] = Field(default=None)
@@ -63,11 +69,36 @@ class Settings(BaseSettings):
     # Apify API Configuration
     # Get your API token from: https://console.apify.com/account/integrations
     APIFY_API_TOKEN: Optional[str] = Field(default=None)
+    # Max Facebook pages scraped concurrently during monitoring
+    FB_MONITOR_CONCURRENCY: int = Field(default=4)
+    # How long scraped page posts are reused before Apify is called again
+    FB_CACHE_TTL_SECONDS: int = Field(default=300)
+    # Facebook page scrapes started per minute (tune to the Apify plan)
+    FB_SCRAPE_RATE_PER_MINUTE: int = Field(default=6)
 
     # Google Trends Configuration
     # pytrends doesn't require API key, but we configure timeout and retry settings
     GOOGLE_TRENDS_TIMEOUT: int = Field(default=30)
     GOOGLE_TRENDS_RETRIES: int = Field(default=3)
+    # Response cache TTLs (seconds), by how quickly each kind of data changes
+    GT_CACHE_TTL_TRENDING: int = Field(default=900)
+    GT_CACHE_TTL_INTEREST: int = Field(default=21600)
+    GT_CACHE_TTL_RELATED: int = Field(default=86400)
+    GT_CACHE_TTL_REGIONAL: int = Field(default=86400)
+    GT_CACHE_TTL_SUGGESTIONS: int = Field(default=3600)
+    # Failed lookups are served from cache for a random TTL in this range
+    GT_NEGATIVE_TTL_MIN: int = Field(default=60)
+    GT_NEGATIVE_TTL_MAX: int = Field(default=180)
+    GT_DISK_CACHE_DIR: Optional[str] = Field(default=None)  # e.g. /var/cache/gtrends; unset disables
+    GT_DISK_CACHE_SIZE_LIMIT: int = Field(default=2**30)
+    GT_IMPERSONATE: str = Field(default="chrome")  # Browser fingerprint when curl_cffi is installed
+    GT_TOKEN_TTL: int = Field(default=300)  # Reuse build_payload widget tokens for this long
+    GT_POOL_SIZE: int = Field(default=4)  # Idle pytrends clients kept warm
+    GT_CONCURRENCY: int = Field(default=2)  # Concurrent requests per analysis
+    GT_RPM: int = Field(default=60)  # Google requests per minute, below the ~100 RPM 429 threshold
+    GT_RATE_LIMIT_COOLDOWN: int = Field(default=60)  # Seconds to pause after a 429
+    GT_RATE_LIMIT_COOLDOWN_MAX: int = Field(default=600)  # Cap on the cooldown after repeated 429s
+    GT_MAX_COOLDOWN_WAIT: int = Field(default=10)  # Longest cooldown a call waits out; longer ones fail fast
 
     # Celery settings
     CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/0")
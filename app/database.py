@@ -1,3 +1,4 @@
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
@@ -7,11 +8,20 @@ connect_args = {}
 if "sqlite" in settings.DATABASE_URL:
     connect_args = {"check_same_thread": False}  # SQLite specific
 
+
+def _json_serializer(value) -> str:
+    # OPT_NON_STR_KEYS keeps parity with json.dumps for int/enum dict keys
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
     future=True,
     connect_args=connect_args,
+    # JSON/JSONB columns (metrics_json, hashtags, ...) are encoded and decoded with orjson
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create async session factory
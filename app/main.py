@@ -1,12 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
 from app.database import init_db, close_db
 from app.redis_client import close_redis
+from app.services.apify_service import close_apify_service
+from app.services.google_trends_service import get_google_trends_service, close_google_trends_service
+from app.services.tiktok_service import close_tiktok_service
 from app.api import auth, reports, ai, webhooks, admin, ingestion, social_media
 
 
@@ -36,10 +40,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Database connection test failed: {str(e)}")
 
+    await get_google_trends_service().start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    await close_apify_service()
+    await close_tiktok_service()
+    close_google_trends_service()
     await close_redis()
     await close_db()
 
@@ -51,6 +60,7 @@ app = FastAPI(
     description="Social Media Monitoring and Sentiment Analysis API - POC Version",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
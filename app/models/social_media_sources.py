@@ -175,6 +175,7 @@ class ApifyScrapedData(Base):
         Index('idx_platform_posted', 'platform', 'posted_at'),
         Index('idx_author_platform', 'author', 'platform'),
         Index('idx_source_platform', 'source_id', 'platform'),
+        Index('idx_apify_collected_at', 'collected_at'),
     )
 
 
@@ -259,4 +260,5 @@ class DataSourceMonitoring(Base):
     __table_args__ = (
         Index('idx_source_status', 'source_type', 'status'),
         Index('idx_last_fetch', 'last_successful_fetch'),
+        Index('idx_source_type_name', 'source_type', 'source_name', unique=True),
     )
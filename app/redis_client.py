@@ -16,6 +16,11 @@ async def get_redis_pool():
     return redis_pool
 
 
+def report_progress_key(report_id: str) -> str:
+    """Redis key holding a report's in-flight generation progress"""
+    return f"report:{report_id}:progress"
+
+
 async def get_redis():
     pool = await get_redis_pool()
     return redis.Redis(connection_pool=pool)
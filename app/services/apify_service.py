@@ -4,18 +4,25 @@ Uses Apify platform for robust, scalable web scraping operations
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime
 import asyncio
 import uuid
+import impit
 from apify_client import ApifyClient
 from apify_client.client import ApifyClientAsync
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Network failures worth retrying an actor run for; anything else (e.g. a
+# KeyError from a changed payload) fails fast instead of burning the retry budget.
+# apify-client makes its requests with impit and raises its transport errors
+# once its own per-request retries are used up.
+TRANSIENT_ERRORS = (ConnectionError, asyncio.TimeoutError, impit.TransportError)
+
 
 class ApifyService:
     """
@@ -43,14 +50,41 @@ class ApifyService:
             "facebook": "apify/facebook-posts-scraper"  # Facebook Posts Scraper
         }
 
+    async def aclose(self):
+        """
+        Close the Apify clients' pooled HTTP connections
+
+        The clients are reopened on next use, so references to this service
+        held elsewhere (e.g. by FacebookService) stay usable.
+        """
+        for apify_client in (self.client, self.async_client):
+            http_client = getattr(apify_client, "http_client", None)
+            if http_client is None:
+                continue
+            try:
+                http_client.impit_client.__exit__(None, None, None)
+                await http_client.impit_async_client.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error closing Apify HTTP client: {e}")
+
+        self.client = None
+        self.async_client = None
+        logger.info("Apify Service closed")
+
     def _check_client(self):
-        """Check if client is initialized"""
+        """Check if client is initialized, reopening it after aclose()"""
+        if self.api_token and (not self.client or not self.async_client):
+            self.client = ApifyClient(self.api_token)
+            self.async_client = ApifyClientAsync(self.api_token)
+
         if not self.client or not self.async_client:
             raise ValueError("Apify API token not configured. Please set APIFY_API_TOKEN in environment variables.")
 
     @retry(
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=20)
+        wait=wait_exponential(multiplier=1, min=4, max=20),
+        reraise=True
     )
     async def run_actor(
         self,
@@ -70,6 +104,10 @@ class ApifyService:
 
         Returns:
             Actor run result data
+
+        Raises:
+            One of TRANSIENT_ERRORS once the retries are used up; other
+            errors are returned as {"status": "failed", "error": ...}
         """
         try:
             self._check_client()
@@ -113,6 +151,10 @@ class ApifyService:
             logger.info(f"Actor run completed: {result['item_count']} items collected")
             return result
 
+        except TRANSIENT_ERRORS as e:
+            logger.warning(f"Transient error running actor {actor_id}: {e}")
+            raise
+
         except Exception as e:
             logger.error(f"Error running actor {actor_id}: {e}")
             return {
@@ -128,7 +170,8 @@ class ApifyService:
     async def scrape_facebook_page(
         self,
         page_url: str,
-        posts_limit: int = 50
+        posts_limit: int = 50,
+        detail_level: Literal["summary", "full"] = "full"
     ) -> Dict[str, Any]:
         """
         Scrape Facebook page posts using official Facebook Posts Scraper
@@ -140,6 +183,7 @@ class ApifyService:
         Args:
             page_url: Facebook page URL (e.g., "https://www.facebook.com/nytimes")
             posts_limit: Maximum number of posts to scrape
+            detail_level: "summary" drops heavy media fields (images, video_url)
 
         Returns:
             Facebook page posts data
@@ -162,8 +206,14 @@ class ApifyService:
                 timeout_secs=300
             )
 
+            if "error" in result:
+                return {"platform": "facebook", "page_url": page_url, "error": result["error"]}
+
             # Transform data to standardized format
-            transformed_data = self._transform_facebook_data(result.get("data", []))
+            transformed_data = self._transform_facebook_data(
+                result.get("data", []),
+                detail_level=detail_level
+            )
 
             return {
                 "platform": "facebook",
@@ -177,6 +227,80 @@ class ApifyService:
             logger.error(f"Error scraping Facebook page: {e}")
             return {"platform": "facebook", "page_url": page_url, "error": str(e)}
 
+    async def scrape_facebook_pages_bulk(
+        self,
+        page_urls: List[str],
+        posts_limit: int = 50,
+        detail_level: Literal["summary", "full"] = "full"
+    ) -> Dict[str, Any]:
+        """
+        Scrape several Facebook pages in a single actor run
+
+        All URLs are passed as startUrls, so the actor start-up and API round
+        trips are paid once instead of once per page.
+
+        Args:
+            page_urls: Facebook page URLs to scrape
+            posts_limit: Maximum number of posts to scrape per page
+            detail_level: "summary" drops heavy media fields (images, video_url)
+
+        Returns:
+            Posts grouped by requested page URL under "posts_by_page"
+        """
+        try:
+            logger.info(f"Scraping {len(page_urls)} Facebook pages in one run")
+
+            run_input = {
+                "startUrls": [{"url": url} for url in page_urls],
+                "resultsLimit": posts_limit,
+                "proxy": {
+                    "useApifyProxy": True
+                }
+            }
+
+            result = await self.run_actor(
+                actor_id=self.actors["facebook"],
+                run_input=run_input,
+                timeout_secs=300 + 60 * len(page_urls)
+            )
+
+            if "error" in result:
+                return {"platform": "facebook", "page_urls": page_urls, "error": result["error"]}
+
+            # Dataset items carry the start URL they were scraped from
+            url_keys = {url.rstrip("/").lower(): url for url in page_urls}
+            posts_by_page: Dict[str, List[Dict[str, Any]]] = {url: [] for url in page_urls}
+            unmatched = 0
+
+            for item in result.get("data", []):
+                source_url = item.get("inputUrl") or item.get("facebookUrl") or ""
+                page_url = url_keys.get(source_url.rstrip("/").lower())
+                if page_url is None:
+                    unmatched += 1
+                    continue
+                try:
+                    posts_by_page[page_url].append(
+                        self._transform_facebook_post(item, detail_level=detail_level)
+                    )
+                except Exception as e:
+                    logger.error(f"Error transforming Facebook item: {e}")
+
+            if unmatched:
+                logger.warning(f"{unmatched} Facebook items could not be matched to a page URL")
+
+            return {
+                "platform": "facebook",
+                "page_urls": page_urls,
+                "posts_by_page": posts_by_page,
+                "unmatched_items": unmatched,
+                "total_posts": sum(len(posts) for posts in posts_by_page.values()),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        except Exception as e:
+            logger.error(f"Error scraping Facebook pages in bulk: {e}")
+            return {"platform": "facebook", "page_urls": page_urls, "error": str(e)}
+
     async def scrape_twitter_search(
         self,
         search_queries: List[str],
@@ -304,7 +428,8 @@ class ApifyService:
 
     def _transform_facebook_data(
         self,
-        raw_data: List[Dict[str, Any]]
+        raw_data: List[Dict[str, Any]],
+        detail_level: Literal["summary", "full"] = "full"
     ) -> List[Dict[str, Any]]:
         """
         Transform Facebook data from Facebook Posts Scraper to standard format
@@ -316,7 +441,7 @@ class ApifyService:
 
         for item in raw_data:
             try:
-                transformed_item = self._transform_facebook_post(item)
+                transformed_item = self._transform_facebook_post(item, detail_level=detail_level)
                 transformed.append(transformed_item)
             except Exception as e:
                 logger.error(f"Error transforming Facebook item: {e}")
@@ -327,12 +452,15 @@ class ApifyService:
     def _transform_facebook_post(
         self,
         post: Dict[str, Any],
-        page_name: Optional[str] = None
+        page_name: Optional[str] = None,
+        detail_level: Literal["summary", "full"] = "full"
     ) -> Dict[str, Any]:
         """
         Transform single Facebook post from Facebook Posts Scraper
         
         Expected fields: postText, postUrl, likes, comments, shares, time, etc.
+        At "summary" detail the image list and video URL are omitted; the
+        has_image/has_video flags are always present.
         """
         # Extract metrics
         likes = post.get("likes", 0)
@@ -343,7 +471,7 @@ class ApifyService:
         post_url = post.get("postUrl") or post.get("url", "")
         post_id = post.get("postId") or post_url.split("/")[-1] if post_url else str(uuid.uuid4())
         
-        return {
+        transformed = {
             "source": "facebook",
             "source_id": post_id,
             "page": page_name or post.get("pageName", ""),
@@ -358,14 +486,18 @@ class ApifyService:
             "media_type": "video" if post.get("video") else ("image" if post.get("image") else "text"),
             "has_video": bool(post.get("video")),
             "has_image": bool(post.get("image")),
-            "images": post.get("images", []),
-            "video_url": post.get("video"),
             "posted_at": post.get("time") or post.get("timestamp"),
             "collected_at": datetime.utcnow().isoformat(),
             "url": post_url,
             "geo_location": "Nigeria"
         }
 
+        if detail_level == "full":
+            transformed["images"] = post.get("images", [])
+            transformed["video_url"] = post.get("video")
+
+        return transformed
+
     def _transform_twitter_data(
         self,
         raw_data: List[Dict[str, Any]]
@@ -572,3 +704,10 @@ def get_apify_service() -> ApifyService:
     if _apify_service is None:
         _apify_service = ApifyService()
     return _apify_service
+
+
+async def close_apify_service():
+    """Close the Apify service's connections if one was created"""
+    # The instance is kept: other service singletons hold a reference to it
+    if _apify_service is not None:
+        await _apify_service.aclose()
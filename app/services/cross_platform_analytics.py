@@ -180,12 +180,14 @@ class CrossPlatformAnalyticsService:
             )
             for row in tiktok_result.all():
                 if row[0]:  # hashtags
+                    likes = row[1] or 0
+                    views = row[2] or 0
                     for tag in row[0]:
                         all_hashtags.append({
                             "hashtag": tag,
                             "platform": "tiktok",
-                            "likes": row[1] or 0,
-                            "views": row[2] or 0
+                            "likes": likes,
+                            "views": views
                         })
 
             # Facebook hashtags (extracted from post text)
@@ -198,21 +200,25 @@ class CrossPlatformAnalyticsService:
             )
             for row in apify_result.all():
                 if row[0]:  # hashtags
+                    # Metrics are per post, so read them once for all of its tags
                     metrics = row[1] or {}
+                    likes = metrics.get("likes", 0)
+                    views = metrics.get("views", 0)
                     for tag in row[0]:
                         all_hashtags.append({
                             "hashtag": tag,
                             "platform": row[2],
-                            "likes": metrics.get("likes", 0),
-                            "views": metrics.get("views", 0)
+                            "likes": likes,
+                            "views": views
                         })
 
             # Aggregate hashtags
             hashtag_stats = {}
             for item in all_hashtags:
                 tag = item["hashtag"].lower()
-                if tag not in hashtag_stats:
-                    hashtag_stats[tag] = {
+                stats = hashtag_stats.get(tag)
+                if stats is None:
+                    stats = hashtag_stats[tag] = {
                         "hashtag": tag,
                         "count": 0,
                         "total_likes": 0,
@@ -220,10 +226,10 @@ class CrossPlatformAnalyticsService:
                         "platforms": set()
                     }
 
-                hashtag_stats[tag]["count"] += 1
-                hashtag_stats[tag]["total_likes"] += item["likes"]
-                hashtag_stats[tag]["total_views"] += item["views"]
-                hashtag_stats[tag]["platforms"].add(item["platform"])
+                stats["count"] += 1
+                stats["total_likes"] += item["likes"]
+                stats["total_views"] += item["views"]
+                stats["platforms"].add(item["platform"])
 
             # Convert to list and sort
             trending = [
@@ -5,16 +5,162 @@ Now uses Apify for robust scraping
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import asyncio
-from tenacity import retry, stop_after_attempt, wait_exponential
+import heapq
+import re
+import time
+import weakref
+from aiolimiter import AsyncLimiter
+
+# Aho-Corasick automaton for multi-keyword search
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 from app.config import settings
-from app.services.apify_service import get_apify_service
 
 logger = logging.getLogger(__name__)
 
+# Posts requested from Apify for each "page" of a page/keyword search
+POSTS_PER_PAGE = 50
+
+# Max (page, limit, detail) entries kept in the scrape cache
+SCRAPE_CACHE_SIZE = 256
+
+# Shared read-only default for missing nested dicts; never mutate
+_EMPTY: Dict[str, Any] = {}
+
+
+def _get_metrics(post: Dict[str, Any]) -> Dict[str, Any]:
+    """A post's metrics dict, or _EMPTY when the post has none"""
+    return post.get("metrics") or _EMPTY
+
+
+def _page_url(page_name: str) -> str:
+    """Turn a Facebook page name (e.g. "punchng") into a page URL; URLs pass through"""
+    if page_name.startswith(("http://", "https://")):
+        return page_name
+    return f"https://www.facebook.com/{page_name.strip('/')}"
+
+
+def _post_text_fields(post: Dict[str, Any]) -> Tuple[str, ...]:
+    """
+    Get the searchable text fields of a post
+
+    Handles both the Apify post format (content is a string) and the
+    legacy format (content is a dict with text/post_text).
+    """
+    content = post.get("content")
+    if isinstance(content, str):
+        return (content,)
+    if not content:
+        return ()
+    return (content.get("text") or "", content.get("post_text") or "")
+
+
+def _post_text(post: Dict[str, Any]) -> str:
+    """Get the searchable text of a post as a single string"""
+    return "\n".join(filter(None, _post_text_fields(post)))
+
+
+def _engagement_score(metrics: Dict[str, Any]) -> float:
+    """
+    Weighted engagement score for a post's metrics
+
+    Comments and shares are weighted more heavily than likes.
+    """
+    return (
+        metrics.get("likes", 0) * 1.0 +
+        metrics.get("comments", 0) * 3.0 +
+        metrics.get("shares", 0) * 5.0
+    )
+
+
+def _total_engagement(metrics: Dict[str, Any]) -> int:
+    """Likes + comments + shares; Apify posts carry no precomputed total"""
+    return metrics.get("likes", 0) + metrics.get("comments", 0) + metrics.get("shares", 0)
+
+
+def _transform_post(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform one Facebook post to the social media pipeline format"""
+    content_data = post.get("content") or _EMPTY
+    metrics = _get_metrics(post)
+    timestamp = post.get("timestamp") or _EMPTY
+
+    return {
+        "source": "facebook",
+        "source_id": post.get("post_id"),
+        "author": post.get("author"),
+        "page": post.get("page"),
+        "content": content_data.get("text") or content_data.get("post_text", ""),
+        "metrics": {
+            "likes": metrics.get("likes", 0),
+            "comments": metrics.get("comments", 0),
+            "shares": metrics.get("shares", 0),
+            "total_engagement": metrics.get("total_engagement", 0),
+            "engagement_score": _engagement_score(metrics)
+        },
+        "media": {
+            "has_image": content_data.get("has_image", False),
+            "has_video": content_data.get("has_video", False),
+            "link": content_data.get("link")
+        },
+        "posted_at": timestamp.get("posted_at"),
+        "collected_at": timestamp.get("collected_at"),
+        "geo_location": post.get("geo_location", "Nigeria"),
+        "post_url": content_data.get("post_url")
+    }
+
+
+def _try_transform_post(post: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Transform one post, logging and returning None if it is malformed"""
+    try:
+        return _transform_post(post)
+    except Exception as e:
+        logger.error(f"Error transforming post data: {e}")
+        return None
+
+
+def _build_keyword_matcher(keywords: List[str]):
+    """
+    Build a case-insensitive matcher for several keywords at once
+
+    Returns a callable mapping a text to the set of keywords it contains.
+    Uses a single Aho-Corasick automaton when pyahocorasick is installed, so
+    each text is scanned once regardless of the number of keywords.
+    """
+    folded_keywords: Dict[str, List[str]] = {}
+    for keyword in keywords:
+        folded = keyword.casefold()
+        if folded:
+            folded_keywords.setdefault(folded, []).append(keyword)
+
+    if AHOCORASICK_AVAILABLE and folded_keywords:
+        automaton = ahocorasick.Automaton()
+        for folded in folded_keywords:
+            automaton.add_word(folded, folded)
+        automaton.make_automaton()
+
+        def match(text: str) -> set:
+            found = {folded for _, folded in automaton.iter(text.casefold())}
+            return {k for folded in found for k in folded_keywords[folded]}
+    else:
+        def match(text: str) -> set:
+            text_folded = text.casefold()
+            return {
+                k
+                for folded, originals in folded_keywords.items()
+                if folded in text_folded
+                for k in originals
+            }
+
+    return match
+
 
 class FacebookService:
     """
@@ -24,6 +170,9 @@ class FacebookService:
 
     def __init__(self):
         """Initialize Facebook service"""
+        # Imported here so the Apify client is only loaded when the service is used
+        from app.services.apify_service import get_apify_service
+
         self.apify_service = get_apify_service()
 
         # Nigerian pages and groups to monitor
@@ -38,48 +187,180 @@ class FacebookService:
             "https://www.facebook.com/premiumtimesng"
         ]
 
+        # Recent scrape results and in-flight scrapes, keyed by
+        # (page_url, posts_limit, detail_level)
+        self._scrape_cache: "OrderedDict[Tuple[str, int, str], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._scrape_inflight: Dict[Tuple[str, int, str], asyncio.Task] = {}
+
+        # Apify rate limiters, one per event loop (each Celery task runs its own loop)
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncLimiter]" = (
+            weakref.WeakKeyDictionary()
+        )
+
         logger.info("Facebook Service initialized with Apify integration")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=2, min=4, max=30)
-    )
     async def scrape_page_posts(
         self,
         page_url: str,
-        posts_limit: int = 50
+        posts_limit: int = 50,
+        detail_level: Literal["summary", "full"] = "full"
     ) -> List[Dict[str, Any]]:
         """
         Scrape posts from a Facebook page using Apify
 
+        Results are cached for FB_CACHE_TTL_SECONDS, and concurrent calls for
+        the same page share a single Apify run.
+
         Args:
-            page_url: Facebook page URL
+            page_url: Facebook page URL, or a page name such as "punchng"
             posts_limit: Maximum number of posts to scrape
+            detail_level: "summary" skips heavy media fields not needed for
+                engagement analytics
 
         Returns:
             List of post data dictionaries
         """
-        try:
-            logger.info(f"Scraping posts from page: {page_url} using Apify")
-
-            # Use Apify service to scrape Facebook page
-            result = await self.apify_service.scrape_facebook_page(
-                page_url=page_url,
-                posts_limit=posts_limit
+        page_url = _page_url(page_url)
+        key = (page_url, posts_limit, detail_level)
+
+        cached = self._scrape_cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < settings.FB_CACHE_TTL_SECONDS:
+                self._scrape_cache.move_to_end(key)
+                return list(cached[1])
+            del self._scrape_cache[key]
+
+        task = self._scrape_inflight.get(key)
+        # A task left over from a previous event loop (e.g. another Celery run) can't be awaited
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(
+                self._fetch_page_posts(page_url, posts_limit, detail_level)
             )
+            self._scrape_inflight[key] = task
+            task.add_done_callback(lambda t: self._store_scrape_result(key, t))
+
+        # Shielded so one cancelled caller doesn't cancel the shared scrape
+        return list(await asyncio.shield(task))
+
+    def _store_scrape_result(self, key: Tuple[str, int, str], task: asyncio.Task):
+        """Cache a finished scrape and drop it from the in-flight table"""
+        if self._scrape_inflight.get(key) is task:
+            del self._scrape_inflight[key]
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        posts = task.result()
+        # Failed scrapes come back empty; don't pin them for the whole TTL
+        if not posts:
+            return
+
+        self._scrape_cache[key] = (time.monotonic(), posts)
+        self._scrape_cache.move_to_end(key)
+        while len(self._scrape_cache) > SCRAPE_CACHE_SIZE:
+            self._scrape_cache.popitem(last=False)
+
+    def _get_limiter(self) -> AsyncLimiter:
+        """Get the Apify scrape rate limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = self._limiters[loop] = AsyncLimiter(settings.FB_SCRAPE_RATE_PER_MINUTE, 60)
+        return limiter
+
+    async def _fetch_page_posts(
+        self,
+        page_url: str,
+        posts_limit: int,
+        detail_level: Literal["summary", "full"]
+    ) -> List[Dict[str, Any]]:
+        """
+        Scrape posts from a Facebook page with Apify, bypassing the cache
 
-            if "error" in result:
-                logger.error(f"Apify scraping error: {result['error']}")
-                return []
-
-            posts = result.get("posts", [])
-            logger.info(f"Scraped {len(posts)} posts from {page_url}")
-            return posts
+        Transient network errors are retried inside ApifyService.run_actor;
+        a scrape that still fails comes back as an empty list.
+        """
+        logger.info(f"Scraping posts from page: {page_url} using Apify")
 
+        try:
+            # Only waits when the per-minute scrape budget is used up
+            async with self._get_limiter():
+                # Use Apify service to scrape Facebook page
+                result = await self.apify_service.scrape_facebook_page(
+                    page_url=page_url,
+                    posts_limit=posts_limit,
+                    detail_level=detail_level
+                )
         except Exception as e:
             logger.error(f"Error scraping page {page_url}: {e}")
             return []
 
+        if "error" in result:
+            logger.error(f"Apify scraping error: {result['error']}")
+            return []
+
+        posts = result.get("posts", [])
+        logger.info(f"Scraped {len(posts)} posts from {page_url}")
+        return posts
+
+    async def _scrape_pages_bulk(
+        self,
+        page_urls: List[str],
+        posts_per_page: int
+    ) -> Optional[List[Any]]:
+        """
+        Scrape all pages with one Apify run
+
+        Returns:
+            Posts per page in page_urls order, or None if the bulk run failed
+            or its items could not be attributed to pages
+        """
+        if not page_urls:
+            return []
+
+        bulk = await self.apify_service.scrape_facebook_pages_bulk(
+            page_urls=page_urls,
+            posts_limit=posts_per_page,
+            detail_level="summary"
+        )
+
+        if "error" in bulk:
+            logger.warning(f"Bulk Facebook scrape failed, scraping pages individually: {bulk['error']}")
+            return None
+        if bulk.get("unmatched_items") and not bulk.get("total_posts"):
+            logger.warning("Bulk Facebook scrape returned no page URLs, scraping pages individually")
+            return None
+
+        posts_by_page = bulk["posts_by_page"]
+        return [posts_by_page.get(page_url, []) for page_url in page_urls]
+
+    async def _scrape_pages_concurrently(
+        self,
+        page_urls: List[str],
+        posts_per_page: int
+    ) -> List[Any]:
+        """
+        Scrape pages with one Apify run each, a few at a time
+
+        Returns:
+            Posts (or the raised exception) per page in page_urls order
+        """
+        # The semaphore caps parallel Apify runs
+        sem = asyncio.BoundedSemaphore(settings.FB_MONITOR_CONCURRENCY or 4)
+
+        async def _scrape_one(page_url: str):
+            async with sem:
+                return await self.scrape_page_posts(
+                    page_url=page_url,
+                    posts_limit=posts_per_page,
+                    detail_level="summary"
+                )
+
+        return await asyncio.gather(
+            *(_scrape_one(page_url) for page_url in page_urls),
+            return_exceptions=True
+        )
+
     async def monitor_nigerian_pages(
         self,
         posts_per_page: int = 50,
@@ -101,42 +382,34 @@ class FacebookService:
             # Use provided page list or default Nigerian pages
             pages_to_monitor = page_list if page_list is not None else self.nigerian_pages
 
+            results = await self._scrape_pages_bulk(pages_to_monitor, posts_per_page)
+            if results is None:
+                results = await self._scrape_pages_concurrently(pages_to_monitor, posts_per_page)
+
             all_posts = []
             page_stats = []
 
-            for page_url in pages_to_monitor:
-                try:
-                    # Scrape posts from each page using Apify
-                    posts = await self.scrape_page_posts(
-                        page_url=page_url,
-                        posts_limit=posts_per_page
+            for page_url, posts in zip(pages_to_monitor, results):
+                if isinstance(posts, BaseException):
+                    logger.error(f"Error monitoring page {page_url}: {posts}")
+                    continue
+
+                all_posts.extend(posts)
+
+                # Calculate page stats
+                if posts:
+                    total_engagement = sum(
+                        m.get("likes", 0) + m.get("comments", 0) + m.get("shares", 0)
+                        for m in map(_get_metrics, posts)
                     )
+                    avg_engagement = total_engagement / len(posts)
 
-                    all_posts.extend(posts)
-
-                    # Calculate page stats
-                    if posts:
-                        total_engagement = sum(
-                            p.get("metrics", {}).get("likes", 0) +
-                            p.get("metrics", {}).get("comments", 0) +
-                            p.get("metrics", {}).get("shares", 0)
-                            for p in posts
-                        )
-                        avg_engagement = total_engagement / len(posts) if posts else 0
-
-                        page_stats.append({
-                            "page": page_url,
-                            "post_count": len(posts),
-                            "total_engagement": total_engagement,
-                            "avg_engagement": avg_engagement
-                        })
-
-                    # Rate limiting between pages
-                    await asyncio.sleep(10)  # Increased delay for Apify
-
-                except Exception as e:
-                    logger.error(f"Error monitoring page {page_url}: {e}")
-                    continue
+                    page_stats.append({
+                        "page": page_url,
+                        "post_count": len(posts),
+                        "total_engagement": total_engagement,
+                        "avg_engagement": avg_engagement
+                    })
 
             result = {
                 "posts": all_posts,
@@ -169,25 +442,7 @@ class FacebookService:
         Returns:
             Engagement rate score
         """
-        try:
-            metrics = post_data.get("metrics", {})
-            likes = metrics.get("likes", 0)
-            comments = metrics.get("comments", 0)
-            shares = metrics.get("shares", 0)
-
-            # Weighted engagement score
-            # Comments and shares are weighted more heavily
-            engagement_score = (
-                likes * 1.0 +
-                comments * 3.0 +
-                shares * 5.0
-            )
-
-            return engagement_score
-
-        except Exception as e:
-            logger.error(f"Error calculating engagement rate: {e}")
-            return 0.0
+        return _engagement_score(_get_metrics(post_data))
 
     def transform_to_social_media_format(
         self,
@@ -202,44 +457,7 @@ class FacebookService:
         Returns:
             Transformed data matching pipeline schema
         """
-        transformed = []
-
-        for post in posts:
-            try:
-                content_data = post.get("content", {})
-                metrics = post.get("metrics", {})
-
-                transformed_item = {
-                    "source": "facebook",
-                    "source_id": post.get("post_id"),
-                    "author": post.get("author"),
-                    "page": post.get("page"),
-                    "content": content_data.get("text") or content_data.get("post_text", ""),
-                    "metrics": {
-                        "likes": metrics.get("likes", 0),
-                        "comments": metrics.get("comments", 0),
-                        "shares": metrics.get("shares", 0),
-                        "total_engagement": metrics.get("total_engagement", 0),
-                        "engagement_score": self.calculate_engagement_rate(post)
-                    },
-                    "media": {
-                        "has_image": content_data.get("has_image", False),
-                        "has_video": content_data.get("has_video", False),
-                        "link": content_data.get("link")
-                    },
-                    "posted_at": post.get("timestamp", {}).get("posted_at"),
-                    "collected_at": post.get("timestamp", {}).get("collected_at"),
-                    "geo_location": post.get("geo_location", "Nigeria"),
-                    "post_url": content_data.get("post_url")
-                }
-
-                transformed.append(transformed_item)
-
-            except Exception as e:
-                logger.error(f"Error transforming post data: {e}")
-                continue
-
-        return transformed
+        return [t for post in posts if (t := _try_transform_post(post)) is not None]
 
     async def get_page_analytics(
         self,
@@ -260,7 +478,11 @@ class FacebookService:
             logger.info(f"Analyzing Facebook page: {page_name}")
 
             # Scrape recent posts
-            posts = await self.scrape_page_posts(page_name=page_name, pages=pages)
+            posts = await self.scrape_page_posts(
+                page_url=page_name,
+                posts_limit=pages * POSTS_PER_PAGE,
+                detail_level="summary"
+            )
 
             if not posts:
                 return {
@@ -269,25 +491,35 @@ class FacebookService:
                     "error": "No posts found"
                 }
 
-            # Calculate analytics
-            total_likes = sum(p.get("metrics", {}).get("likes", 0) for p in posts)
-            total_comments = sum(p.get("metrics", {}).get("comments", 0) for p in posts)
-            total_shares = sum(p.get("metrics", {}).get("shares", 0) for p in posts)
-            total_engagement = total_likes + total_comments + total_shares
+            # Calculate analytics and post type distribution in one pass
+            total_likes = total_comments = total_shares = 0
+            posts_with_images = posts_with_videos = 0
+
+            for p in posts:
+                m = _get_metrics(p)
+                total_likes += m.get("likes", 0)
+                total_comments += m.get("comments", 0)
+                total_shares += m.get("shares", 0)
+
+                # Media flags live in the legacy content dict or at the top level of Apify posts;
+                # a video post with a thumbnail image counts as video, like Apify's media_type
+                c = p.get("content")
+                media = c if isinstance(c, dict) else p
+                if media.get("has_video"):
+                    posts_with_videos += 1
+                elif media.get("has_image"):
+                    posts_with_images += 1
 
-            avg_engagement = total_engagement / len(posts) if posts else 0
+            total_engagement = total_likes + total_comments + total_shares
+            avg_engagement = total_engagement / len(posts)
+            text_only_posts = len(posts) - posts_with_images - posts_with_videos
 
             # Identify top posts
-            top_posts = sorted(
+            top_posts = heapq.nlargest(
+                5,
                 posts,
-                key=lambda p: p.get("metrics", {}).get("total_engagement", 0),
-                reverse=True
-            )[:5]
-
-            # Post type distribution
-            posts_with_images = sum(1 for p in posts if p.get("content", {}).get("has_image"))
-            posts_with_videos = sum(1 for p in posts if p.get("content", {}).get("has_video"))
-            text_only_posts = len(posts) - posts_with_images - posts_with_videos
+                key=lambda p: _total_engagement(_get_metrics(p))
+            )
 
             analytics = {
                 "page": page_name,
@@ -306,9 +538,9 @@ class FacebookService:
                 },
                 "top_posts": [
                     {
-                        "post_id": p.get("post_id"),
-                        "content_preview": p.get("content", {}).get("text", "")[:100],
-                        "engagement": p.get("metrics", {}).get("total_engagement", 0)
+                        "post_id": p.get("source_id") or p.get("post_id"),
+                        "content_preview": _post_text(p)[:100],
+                        "engagement": _total_engagement(_get_metrics(p))
                     }
                     for p in top_posts
                 ],
@@ -343,14 +575,18 @@ class FacebookService:
             logger.info(f"Searching for '{keyword}' in {page_name}")
 
             # Scrape posts
-            all_posts = await self.scrape_page_posts(page_name=page_name, pages=pages)
+            all_posts = await self.scrape_page_posts(
+                page_url=page_name,
+                posts_limit=pages * POSTS_PER_PAGE,
+                detail_level="summary"
+            )
 
-            # Filter by keyword
-            keyword_lower = keyword.lower()
+            # Filter by keyword (compiled once, matched without lowercasing
+            # or joining each post's text fields)
+            search = re.compile(re.escape(keyword), re.IGNORECASE).search
             matching_posts = [
                 post for post in all_posts
-                if keyword_lower in post.get("content", {}).get("text", "").lower()
-                or keyword_lower in post.get("content", {}).get("post_text", "").lower()
+                if any(map(search, _post_text_fields(post)))
             ]
 
             logger.info(f"Found {len(matching_posts)} posts matching '{keyword}'")
@@ -360,6 +596,51 @@ class FacebookService:
             logger.error(f"Error searching posts: {e}")
             return []
 
+    async def search_posts_by_keywords(
+        self,
+        page_name: str,
+        keywords: List[str],
+        pages: int = 3
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search for posts containing any of several keywords from a page
+
+        The page is scraped once and every post is scanned in a single pass,
+        independent of the number of keywords.
+
+        Args:
+            page_name: Facebook page name or URL
+            keywords: Keywords to search for
+            pages: Number of pages to search
+
+        Returns:
+            Dictionary mapping each keyword to its matching posts
+        """
+        matches: Dict[str, List[Dict[str, Any]]] = {keyword: [] for keyword in keywords}
+
+        try:
+            logger.info(f"Searching for {len(keywords)} keywords in {page_name}")
+
+            # Scrape posts once for all keywords
+            all_posts = await self.scrape_page_posts(
+                page_url=page_name,
+                posts_limit=pages * POSTS_PER_PAGE,
+                detail_level="summary"
+            )
+
+            match = _build_keyword_matcher(keywords)
+            for post in all_posts:
+                for keyword in match(_post_text(post)):
+                    matches[keyword].append(post)
+
+            logger.info(f"Found matches for {sum(1 for m in matches.values() if m)} "
+                       f"of {len(keywords)} keywords")
+            return matches
+
+        except Exception as e:
+            logger.error(f"Error searching posts: {e}")
+            return matches
+
 
 # Singleton instance
 _facebook_service = None
@@ -4,18 +4,480 @@ Fetches trending topics, search interest, and related queries for Nigeria
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, Iterable, Iterator, AsyncIterator
+from datetime import datetime, timedelta, timezone
 import asyncio
-from pytrends.request import TrendReq
-from pytrends.exceptions import ResponseError
-import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import copy
+import hashlib
+import heapq
+import json
+import random
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+import msgspec
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from aiolimiter import AsyncLimiter
+from cachetools import Cache, LFUCache, TLRUCache, TTLCache
+from pytrends.request import TrendReq, BASE_TRENDS_URL
+from pytrends.exceptions import ResponseError, TooManyRequestsError
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential, wait_random
+
+# Optional on-disk cache tier
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Optional browser-fingerprinted HTTP client (fewer bot-detection 429s)
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
 
 from app.config import settings
+from app.redis_client import get_redis
 
 logger = logging.getLogger(__name__)
 
+# Entries kept per endpoint in the in-process response cache
+CACHE_MAXSIZE = 1024
+
+# Trends rows can carry numpy scalars straight from pytrends DataFrames
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+# How often workers waiting on another worker's fill poll Redis
+FILL_WAIT_INTERVAL = 0.25
+
+# Releases the fill lock only if it still holds this worker's token, so a
+# fill that outlived its lock can't delete a lock another worker now holds
+_UNLOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Most keywords Google Trends accepts in one payload
+PAYLOAD_KEYWORD_LIMIT = 5
+
+# Curated Nigerian topics covering all states, used when no method returns data
+CURATED_TOPICS = (
+    # National news
+    "Nigeria news today", "Nigerian breaking news", "Nigeria latest news",
+    # Politics & Government
+    "Nigeria president", "Nigerian government", "Nigeria election",
+    # Economy
+    "Naira exchange rate", "Nigeria economy", "CBN Nigeria",
+    # Major cities & states
+    "Lagos news", "Abuja news", "Port Harcourt news", "Kano news",
+    "Ibadan news", "Enugu news", "Kaduna news", "Jos news",
+    # Sports
+    "Nigeria football", "Super Eagles", "Nigerian Premier League",
+    # Entertainment
+    "Nigerian music", "Nollywood", "Afrobeats",
+    # Current affairs
+    "Nigeria security", "Nigerian universities", "ASUU strike"
+)
+
+# Last-resort topics when trending collection itself fails
+EMERGENCY_TOPICS = (
+    "Nigeria news", "Lagos", "Abuja", "Nigerian politics",
+    "Naira", "Nigeria football", "Nigerian music", "Nigeria today",
+    "Port Harcourt", "Kano", "Ibadan", "Nigeria president",
+    "Nigerian government", "Nigeria economy", "Nollywood",
+    "Super Eagles", "Nigerian universities", "Nigeria security",
+    "Lagos traffic", "Afrobeats"
+)
+
+# Trending sources by priority (realtime > rising > top > traditional > suggestions)
+SOURCE_PRIORITY = {
+    "realtime_stories": 1,
+    "rising_queries": 2,
+    "top_queries": 3,
+    "traditional_api": 4,
+    "suggestions": 5
+}
+
+
+# Second-resolution UTC timestamp cache: [epoch seconds, ISO string]
+_ts_cache = [0, ""]
+
+
+def _now_iso() -> str:
+    """
+    Current UTC time as a naive ISO string, reformatted at most once a second
+
+    Naive (no "+00:00") to match what the pipeline stores in naive
+    timestamp columns.
+    """
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[1] = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+        _ts_cache[0] = now
+    return _ts_cache[1]
+
+
+# Keep-alive HTTP session per pytrends worker thread
+_thread_sessions = threading.local()
+
+
+def _get_http_session():
+    """
+    Get this thread's HTTP session for Google Trends requests
+
+    Uses curl_cffi impersonating a real browser's TLS fingerprint when it is
+    installed, otherwise a plain requests session. Sessions are per thread
+    because curl_cffi sessions are not thread-safe.
+    """
+    session = getattr(_thread_sessions, "session", None)
+    if session is None:
+        if CURL_CFFI_AVAILABLE:
+            session = curl_requests.Session(impersonate=settings.GT_IMPERSONATE)
+        else:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
+        _thread_sessions.session = session
+    return session
+
+
+# Widget tokens from build_payload, shared by all pooled clients; the same
+# payload (e.g. related queries then regional interest for one keyword) reuses them
+_token_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.GT_TOKEN_TTL)
+_token_lock = threading.Lock()
+
+
+class _SessionTrendReq(TrendReq):
+    """
+    pytrends client that sends every request over a reused session
+
+    Stock pytrends opens a new requests session (new TLS handshake) for every
+    call and always goes through requests' fingerprint; this keeps the
+    pytrends token/widget flow but routes it through _get_http_session().
+    Proxy rotation is not supported.
+    """
+
+    def GetGoogleCookie(self):
+        """Fetch the NID cookie Google expects on Trends API requests"""
+        response = _get_http_session().get(
+            f'{BASE_TRENDS_URL}/explore/?geo={self.hl[-2:]}',
+            timeout=self.timeout
+        )
+        return {name: value for name, value in response.cookies.items() if name == 'NID'}
+
+    def _get_data(self, url, method=TrendReq.GET_METHOD, trim_chars=0, **kwargs):
+        """Send a request to Google and return the parsed JSON response"""
+        response = _get_http_session().request(
+            method.upper(),
+            url,
+            timeout=self.timeout,
+            cookies=self.cookies,
+            headers=self.headers,
+            **kwargs
+        )
+        content_type = response.headers.get('Content-Type', '')
+        if response.status_code == 200 and any(
+            kind in content_type
+            for kind in ('application/json', 'application/javascript', 'text/javascript')
+        ):
+            # Responses start with an XSSI guard like ")]}'," that must be trimmed
+            return orjson.loads(response.content[trim_chars:])
+        if response.status_code == 429:
+            raise TooManyRequestsError.from_response(response)
+        raise ResponseError.from_response(response)
+
+    def _tokens(self):
+        """Fetch widget tokens for the built payload, reusing recent ones for the same payload"""
+        key = (self.hl, self.tz, self.token_payload['req'])
+        with _token_lock:
+            widget_dicts = _token_cache.get(key)
+        if widget_dicts is None:
+            widget_dicts = self._get_data(
+                url=TrendReq.GENERAL_URL,
+                method=TrendReq.POST_METHOD,
+                params=self.token_payload,
+                trim_chars=4,
+            )['widgets']
+            with _token_lock:
+                _token_cache[key] = widget_dicts
+        # Data methods modify widget requests in place, so work on a copy
+        widget_dicts = copy.deepcopy(widget_dicts)
+
+        # Assign widgets exactly as TrendReq._tokens does
+        first_region_token = True
+        self.related_queries_widget_list[:] = []
+        self.related_topics_widget_list[:] = []
+        for widget in widget_dicts:
+            if widget['id'] == 'TIMESERIES':
+                self.interest_over_time_widget = widget
+            if widget['id'] == 'GEO_MAP' and first_region_token:
+                self.interest_by_region_widget = widget
+                first_region_token = False
+            if 'RELATED_TOPICS' in widget['id']:
+                self.related_topics_widget_list.append(widget)
+            if 'RELATED_QUERIES' in widget['id']:
+                self.related_queries_widget_list.append(widget)
+
+    def interest_over_time_records(self) -> List[Dict[str, Any]]:
+        """
+        Interest over time for the built payload, parsed straight from JSON
+
+        Same request as interest_over_time() (the req parameter is encoded
+        with json.dumps exactly as pytrends does, since the token is tied to
+        it), without the DataFrame.
+
+        Returns:
+            List of {"date": ISO timestamp (UTC), "values": {keyword: interest}}
+        """
+        widget = self.interest_over_time_widget
+        req_json = self._get_data(
+            url=TrendReq.INTEREST_OVER_TIME_URL,
+            method=TrendReq.GET_METHOD,
+            trim_chars=5,
+            params={'req': json.dumps(widget['request']), 'token': widget['token'], 'tz': self.tz},
+        )
+        timeline = sorted(req_json['default']['timelineData'], key=lambda point: int(point['time']))
+        return [
+            {
+                "date": datetime.fromtimestamp(int(point['time']), timezone.utc).replace(tzinfo=None).isoformat(),
+                "values": dict(zip(self.kw_list, map(int, point['value'])))
+            }
+            for point in timeline
+        ]
+
+    def interest_by_region_records(self, resolution: str = 'COUNTRY', inc_low_vol: bool = False) -> List[Tuple[str, int]]:
+        """
+        Interest by region for the first payload keyword, parsed straight from JSON
+
+        Same request as interest_by_region(), without the DataFrame.
+
+        Returns:
+            List of (location name, interest) sorted by location name
+        """
+        widget = self.interest_by_region_widget
+        # Google only honours a resolution for worldwide or US queries
+        if self.geo == '' or (self.geo == 'US' and resolution in ('DMA', 'CITY', 'REGION')):
+            widget['request']['resolution'] = resolution
+        widget['request']['includeLowSearchVolumeGeos'] = inc_low_vol
+
+        req_json = self._get_data(
+            url=TrendReq.INTEREST_BY_REGION_URL,
+            method=TrendReq.GET_METHOD,
+            trim_chars=5,
+            params={'req': json.dumps(widget['request']), 'token': widget['token'], 'tz': self.tz},
+        )
+        return sorted(
+            (point['geoName'], int(point['value'][0]))
+            for point in req_json['default']['geoMapData']
+        )
+
+    def related_queries_records(self) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Related queries for each payload keyword, parsed straight from JSON
+
+        Same requests as related_queries(), without building two DataFrames
+        per keyword.
+
+        Returns:
+            {keyword: {"top": [{"query", "value"}], "rising": [{"query", "value"}]}},
+            rising values without a number being "Breakout"
+        """
+        result = {}
+        for widget in self.related_queries_widget_list:
+            try:
+                keyword = widget['request']['restriction']['complexKeywordsRestriction']['keyword'][0]['value']
+            except KeyError:
+                keyword = ''
+            req_json = self._get_data(
+                url=TrendReq.RELATED_QUERIES_URL,
+                method=TrendReq.GET_METHOD,
+                trim_chars=5,
+                params={'req': json.dumps(widget['request']), 'token': widget['token'], 'tz': self.tz},
+            )
+            ranked = [ranked_list.get('rankedKeyword', []) for ranked_list in req_json['default'].get('rankedList', [])]
+            ranked += [[]] * (2 - len(ranked))
+            result[keyword] = {
+                "top": [{"query": item['query'], "value": int(item['value'])} for item in ranked[0]],
+                "rising": [
+                    {"query": item['query'], "value": item.get('value', "Breakout")}
+                    for item in ranked[1]
+                ]
+            }
+        return result
+
+
+class _TTLLFUCache:
+    """
+    LFU cache whose entries also expire after a fixed TTL
+
+    Eviction is by access frequency, so keywords the dashboards ask for all
+    the time stay cached through bursts of one-off queries. Expired entries
+    keep their frequency count until they are refreshed or swept.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self._entries = LFUCache(maxsize)
+        self.ttl = ttl
+        self._timer = timer
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the value for key if present and not expired (counts as a use)"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._timer():
+            return default
+        return entry[1]
+
+    def __setitem__(self, key: Any, value: Any):
+        if key not in self._entries and len(self._entries) >= self._entries.maxsize:
+            # Make room from expired entries before evicting live ones
+            self.expire()
+        self._entries[key] = (self._timer() + self.ttl, value)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """Remove key and return its value, expired or not"""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def expire(self):
+        """Drop all expired entries"""
+        now = self._timer()
+        # Cache.__getitem__ reads without counting as a use
+        expired = [
+            key for key in list(self._entries)
+            if Cache.__getitem__(self._entries, key)[0] <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+
+# Google responses worth retrying: rate limiting and server-side failures
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_server_error_wait = wait_exponential(multiplier=0.5, max=5) + wait_random(0, 0.5)
+
+# Network failures worth retrying: dropped connections and timeouts
+_TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+# The same failures from curl_cffi: resolve, connect, timeout, TLS connect, empty reply, send, recv
+_TRANSIENT_CURL_CODES = frozenset({6, 7, 28, 35, 52, 55, 56})
+
+
+class RateLimitCooldown(Exception):
+    """Raised instead of waiting out a 429 cooldown longer than GT_MAX_COOLDOWN_WAIT"""
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Whether a pytrends error is transient (other 4xx responses are not)"""
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return True
+    if CURL_CFFI_AVAILABLE and isinstance(error, curl_requests.RequestsError):
+        return error.code in _TRANSIENT_CURL_CODES
+    response = getattr(error, "response", None)
+    return isinstance(error, ResponseError) and getattr(response, "status_code", None) in _RETRYABLE_STATUS
+
+
+def _retry_after(error: ResponseError) -> Optional[float]:
+    """Seconds from a response's Retry-After header, if it sent one in that form"""
+    try:
+        return float(error.response.headers["Retry-After"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _retry_wait(retry_state) -> float:
+    """
+    Delay before retrying a pytrends call
+
+    429s wait 0 here because _call already paused every request until the
+    rate-limit window ends (or turns the retry away when that window is long);
+    server and network errors retry quickly with jitter, so concurrent callers
+    don't retry in lockstep.
+    """
+    if isinstance(retry_state.outcome.exception(), TooManyRequestsError):
+        return 0
+    return _server_error_wait(retry_state)
+
+
+def _chunks(items: List[str], size: int = PAYLOAD_KEYWORD_LIMIT) -> Iterator[List[str]]:
+    """Split a keyword list into payload-sized batches"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _merge_by_date(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge interest-over-time batches into one {"date", "values"} row per date"""
+    merged: Dict[str, Dict[str, int]] = {}
+    for result in results:
+        for point in result["data"]:
+            merged.setdefault(point["date"], {}).update(point["values"])
+    return [{"date": date, "values": values} for date, values in sorted(merged.items())]
+
+
+def _canonical_term(term: str) -> str:
+    """Case- and whitespace-insensitive form of a term, for deduplication"""
+    return " ".join(term.casefold().split())
+
+
+def _trending_sort_key(row: "TrendingTerm") -> Tuple[int, float, float]:
+    """Sort key ranking trending rows by source, then by growth and relevance"""
+    growth = row.growth
+    return (
+        SOURCE_PRIORITY.get(row.source, 10),
+        -growth if isinstance(growth, (int, float)) else 0,
+        -(row.relevance or 0)
+    )
+
+
+def _is_fresh(result: Any) -> bool:
+    """Whether a fetch result is real data rather than an error payload, empty series or fallback"""
+    if isinstance(result, dict):
+        return "error" not in result and result.get("data", True) != []
+    return bool(result) and not (isinstance(result[0], dict) and result[0].get("is_fallback"))
+
+
+class TrendingTerm(msgspec.Struct):
+    """Trending-search candidate; fields a source doesn't provide stay UNSET and are left out"""
+    term: str
+    timestamp: str
+    region: str
+    source: str
+    traffic: Any = msgspec.UNSET
+    growth: Any = msgspec.UNSET
+    relevance: Any = msgspec.UNSET
+    parent_keyword: Any = msgspec.UNSET
+    rank: Any = msgspec.UNSET
+
+
+class TrendsMetadata(msgspec.Struct):
+    """Metadata block of a Google Trends pipeline record"""
+    rank: Optional[int]
+    region: str
+    interest_value: Any
+    related_queries: List[Any]
+
+
+class TrendsRecord(msgspec.Struct):
+    """Google Trends item in the social media pipeline schema"""
+    source: str
+    source_id: str
+    content: str
+    data_type: str
+    metadata: TrendsMetadata
+    collected_at: str
+    geo_location: str
+
 
 class GoogleTrendsService:
     """
@@ -27,22 +489,393 @@ class GoogleTrendsService:
         """Initialize Google Trends service"""
         self.timeout = settings.GOOGLE_TRENDS_TIMEOUT
         self.max_retries = settings.GOOGLE_TRENDS_RETRIES
+        # Cross-worker fill lock lifetime: long enough to cover a fill's
+        # requests with every retry (other workers only wait GT_MAX_COOLDOWN_WAIT)
+        self.fill_lock_ms = self.timeout * self.max_retries * 1000
 
         # Nigeria geo code (ISO 3166-2)
         self.nigeria_geo = "NG"
 
         # Nigerian states for regional analysis
-        self.nigerian_states = [
+        self.nigerian_states = frozenset([
             "NG-AB", "NG-AD", "NG-AK", "NG-AN", "NG-BA", "NG-BE", "NG-BO",
             "NG-BY", "NG-CR", "NG-DE", "NG-EB", "NG-ED", "NG-EK", "NG-EN",
             "NG-FC", "NG-GO", "NG-IM", "NG-JI", "NG-KD", "NG-KE", "NG-KN",
             "NG-KO", "NG-KT", "NG-KW", "NG-LA", "NG-NA", "NG-NI", "NG-OG",
             "NG-ON", "NG-OS", "NG-OY", "NG-PL", "NG-RI", "NG-SO", "NG-TA",
             "NG-YO", "NG-ZA"
-        ]
+        ])
+
+        # In-process response caches, one per endpoint
+        self._caches: Dict[str, _TTLLFUCache] = {
+            "trending": _TTLLFUCache(maxsize=CACHE_MAXSIZE, ttl=settings.GT_CACHE_TTL_TRENDING),
+            "interest_over_time": _TTLLFUCache(maxsize=CACHE_MAXSIZE, ttl=settings.GT_CACHE_TTL_INTEREST),
+            "related_queries": _TTLLFUCache(maxsize=CACHE_MAXSIZE, ttl=settings.GT_CACHE_TTL_RELATED),
+            "regional_interest": _TTLLFUCache(maxsize=CACHE_MAXSIZE, ttl=settings.GT_CACHE_TTL_REGIONAL),
+            "suggestions": _TTLLFUCache(maxsize=CACHE_MAXSIZE, ttl=settings.GT_CACHE_TTL_SUGGESTIONS),
+        }
+
+        # Recent failures by (endpoint, key), served for a short jittered TTL so
+        # callers retrying during a 429 window don't keep hitting Google
+        self._negative_cache = TLRUCache(
+            maxsize=CACHE_MAXSIZE,
+            ttu=lambda key, value, now: now + random.uniform(
+                settings.GT_NEGATIVE_TTL_MIN, settings.GT_NEGATIVE_TTL_MAX
+            ),
+            timer=time.monotonic
+        )
+
+        # In-flight fetches by (endpoint, key), so identical concurrent calls
+        # share one outbound request
+        self._inflight: Dict[Tuple[str, Tuple], asyncio.Task] = {}
+
+        # Idle pytrends clients; each keeps the Google cookie it fetched on creation
+        self._client_pool: deque = deque(maxlen=settings.GT_POOL_SIZE)
+
+        # Worker threads and the optional disk tier are created by start()
+        # (or on first use), so constructing the service stays cheap
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._disk = None
+        self._started = False
+        self._start_lock = threading.Lock()
+
+        # Request budget shared by all endpoints, one limiter per event loop,
+        # plus a process-wide pause after Google answers with a 429
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncLimiter]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._backoff_until = 0.0
+        # Consecutive-429 level: each 429 doubles the cooldown, each success steps it back
+        self._throttle_level = 0
 
         logger.info("Google Trends Service initialized for Nigeria")
 
+    async def _cached(
+        self,
+        endpoint: str,
+        key: Tuple,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve an endpoint result from the cache, fetching it on a miss
+
+        Args:
+            endpoint: Cache name (see self._caches)
+            key: Hashable tuple of the call arguments
+            fetch: Coroutine factory that fetches a fresh result (errors and
+                fallbacks are only cached briefly, in the negative cache)
+
+        Returns:
+            Cached or freshly fetched result, copied so callers can't mutate
+            the cached entry
+        """
+        cache = self._caches[endpoint]
+        result = cache.get(key)
+        if result is not None:
+            return copy.deepcopy(result)
+
+        inflight_key = (endpoint, key)
+        result = self._negative_cache.get(inflight_key)
+        if result is not None:
+            return copy.deepcopy(result)
+
+        task = self._inflight.get(inflight_key)
+        # A task left over from a previous event loop (e.g. another Celery run) can't be awaited
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fill(endpoint, key, fetch))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda t: self._drop_inflight(inflight_key, t))
+
+        # Shielded so one cancelled caller doesn't cancel the shared fetch
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _drop_inflight(self, inflight_key: Tuple[str, Tuple], task: asyncio.Task):
+        """Remove a finished fetch from the in-flight table"""
+        if self._inflight.get(inflight_key) is task:
+            del self._inflight[inflight_key]
+
+    async def _fill(
+        self,
+        endpoint: str,
+        key: Tuple,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Fill a cache miss from Redis, then the disk cache, then Google"""
+        await self.start()
+        cache = self._caches[endpoint]
+        ttl = int(cache.ttl)
+        redis_key = self._redis_key(endpoint, key)
+        redis = await self._get_redis()
+        lock_token = None
+        if redis is not None:
+            result, lock_token = await self._redis_lookup(redis, redis_key)
+            if result is not None:
+                cache[key] = result
+                return result
+
+        try:
+            result = await self._disk_get(redis_key)
+            from_origin = result is None
+            if from_origin:
+                result = await fetch()
+
+            if _is_fresh(result):
+                cache[key] = result
+                if redis is not None:
+                    await self._redis_store(redis, redis_key, result, ttl)
+                if from_origin:
+                    await self._disk_set(redis_key, result, ttl)
+            else:
+                self._negative_cache[(endpoint, key)] = result
+        finally:
+            if lock_token is not None:
+                await self._redis_unlock(redis, redis_key, lock_token)
+        return result
+
+    @staticmethod
+    def _redis_key(endpoint: str, key: Tuple) -> str:
+        """Build a process-independent Redis key for a cache entry"""
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return f"gt:{endpoint}:{digest}"
+
+    async def _get_redis(self):
+        """Get the shared Redis client, or None when Redis is unreachable"""
+        try:
+            return await get_redis()
+        except Exception as e:
+            logger.warning(f"Redis unavailable for Google Trends cache: {e}")
+            return None
+
+    async def _disk_get(self, disk_key: str) -> Optional[Any]:
+        """Read an entry from the disk cache, if one is configured"""
+        if self._disk is None:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._disk.get, disk_key)
+        except Exception as e:
+            logger.warning(f"Disk cache lookup failed for {disk_key}: {e}")
+            return None
+
+    async def _disk_set(self, disk_key: str, value: Any, ttl: int):
+        """Write an entry to the disk cache, if one is configured"""
+        if self._disk is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._executor, lambda: self._disk.set(disk_key, value, expire=ttl)
+            )
+        except Exception as e:
+            logger.warning(f"Disk cache store failed for {disk_key}: {e}")
+
+    async def _redis_lookup(self, redis, redis_key: str) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Read an entry from Redis, coordinating the fill with other workers
+
+        Args:
+            redis: Redis client
+            redis_key: Entry key
+
+        Returns:
+            Tuple of (cached value or None, this worker's fill lock token or None)
+        """
+        lock_key = f"gt:lock:{redis_key}"
+        try:
+            payload = await redis.get(redis_key)
+            if payload is not None:
+                return orjson.loads(payload), None
+
+            token = uuid.uuid4().hex
+            if await redis.set(lock_key, token, nx=True, px=self.fill_lock_ms):
+                return None, token
+
+            # Another worker is fetching; wait briefly for its result, then
+            # fetch here rather than hold the caller for the whole lock lifetime
+            for _ in range(int(settings.GT_MAX_COOLDOWN_WAIT / FILL_WAIT_INTERVAL)):
+                await asyncio.sleep(FILL_WAIT_INTERVAL)
+                payload = await redis.get(redis_key)
+                if payload is not None:
+                    return orjson.loads(payload), None
+                if not await redis.exists(lock_key):
+                    break
+        except Exception as e:
+            logger.warning(f"Redis lookup failed for {redis_key}: {e}")
+        return None, None
+
+    async def _redis_store(self, redis, redis_key: str, value: Any, ttl: int):
+        """Write an entry to Redis, ignoring Redis failures"""
+        try:
+            await redis.set(redis_key, orjson.dumps(value, option=ORJSON_OPTIONS), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis store failed for {redis_key}: {e}")
+
+    async def _redis_unlock(self, redis, redis_key: str, token: str):
+        """Release the cross-worker fill lock, if this worker still holds it"""
+        try:
+            await redis.eval(_UNLOCK_SCRIPT, 1, f"gt:lock:{redis_key}", token)
+        except Exception as e:
+            logger.warning(f"Redis unlock failed for {redis_key}: {e}")
+
+    def invalidate(self, endpoint: str, key: Tuple):
+        """Drop one result from the in-process cache (Redis entries expire on their TTL)"""
+        self._caches[endpoint].pop(key, None)
+        self._negative_cache.pop((endpoint, key), None)
+
+    def clear(self):
+        """Drop all cached results"""
+        for cache in self._caches.values():
+            cache.clear()
+        self._negative_cache.clear()
+
+    async def _with_client(self, fetch: Callable[..., Awaitable[Any]], *args) -> Any:
+        """
+        Run a fetch with a pooled pytrends client
+
+        Clients are returned to the pool after a successful fetch and dropped
+        after an error (typically a 429), so the next call gets a fresh cookie.
+
+        Args:
+            fetch: Coroutine function taking the client followed by *args
+            *args: Remaining fetch arguments
+
+        Returns:
+            The fetch result
+        """
+        try:
+            pytrends = self._client_pool.pop()
+        except IndexError:
+            # Creating a client fetches a Google cookie, so keep it off the loop
+            pytrends = await self._call(self._get_pytrends_client)
+
+        result = await fetch(pytrends, *args)
+        if _is_fresh(result):
+            self._client_pool.append(pytrends)
+        return result
+
+    async def start(self):
+        """
+        Create the worker threads and open the disk cache ahead of the first request
+
+        Optional: the first request awaits this itself. Opening the disk cache
+        touches the filesystem, so it always runs off the event loop.
+        """
+        if not self._started:
+            await asyncio.get_running_loop().run_in_executor(None, self._ensure_started)
+
+    def _ensure_started(self):
+        """Create the worker threads and the optional disk cache once"""
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+
+            # Threads for blocking pytrends calls, kept apart from the default
+            # executor so slow Google requests cannot starve other blocking work
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.GT_POOL_SIZE,
+                thread_name_prefix="gtrends"
+            )
+
+            # Optional on-disk tier below Redis, so restarts start warm
+            if settings.GT_DISK_CACHE_DIR:
+                if DISKCACHE_AVAILABLE:
+                    self._disk = diskcache.Cache(
+                        settings.GT_DISK_CACHE_DIR,
+                        size_limit=settings.GT_DISK_CACHE_SIZE_LIMIT
+                    )
+                else:
+                    logger.warning("GT_DISK_CACHE_DIR is set but diskcache is not installed")
+
+            self._started = True
+
+    def close(self):
+        """
+        Shut down the pytrends worker threads and the disk cache
+
+        Calls still queued are cancelled; calls already running finish in the
+        background.
+        """
+        with self._start_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+            self._started = False
+        self._client_pool.clear()
+        logger.info("Google Trends Service closed")
+
+    def _get_limiter(self) -> AsyncLimiter:
+        """Get the Google Trends request limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = self._limiters[loop] = AsyncLimiter(settings.GT_RPM, 60)
+        return limiter
+
+    async def _call(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking pytrends call in the executor within the request budget
+
+        429 and 5xx responses, dropped connections and timeouts are retried
+        (up to GOOGLE_TRENDS_RETRIES attempts, with jittered backoff); a 429 also pauses all requests for the response's
+        Retry-After, or a jittered cooldown when it doesn't send one. The
+        cooldown doubles with each further 429 (up to
+        GT_RATE_LIMIT_COOLDOWN_MAX) and eases back one step per successful
+        call. Callers only wait out a cooldown of up to GT_MAX_COOLDOWN_WAIT;
+        during a longer one they get RateLimitCooldown at once, so fetches fail
+        fast into the negative cache instead of holding workers. Other errors
+        are raised straight away.
+
+        Args:
+            func: pytrends method or callable making one Google request
+            *args: Arguments for func
+
+        Returns:
+            Whatever func returns
+
+        Raises:
+            RateLimitCooldown: Requests are paused for longer than GT_MAX_COOLDOWN_WAIT
+        """
+        await self.start()
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=_retry_wait,
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                delay = self._backoff_until - time.monotonic()
+                if delay > settings.GT_MAX_COOLDOWN_WAIT:
+                    raise RateLimitCooldown(f"Google Trends requests paused for another {delay:.0f}s")
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                async with self._get_limiter():
+                    try:
+                        result = await asyncio.get_running_loop().run_in_executor(
+                            self._executor, func, *args
+                        )
+                    except TooManyRequestsError as e:
+                        cooldown = min(
+                            settings.GT_RATE_LIMIT_COOLDOWN * 2 ** self._throttle_level,
+                            settings.GT_RATE_LIMIT_COOLDOWN_MAX
+                        )
+                        if cooldown < settings.GT_RATE_LIMIT_COOLDOWN_MAX:
+                            self._throttle_level += 1
+                        pause = _retry_after(e) or random.uniform(0.5, 1.0) * cooldown
+                        self._backoff_until = max(self._backoff_until, time.monotonic() + pause)
+                        logger.warning(f"Google Trends rate limit hit, pausing requests for {pause:.0f}s")
+                        raise
+
+                if self._throttle_level:
+                    self._throttle_level -= 1
+                return result
+
     def _get_pytrends_client(self) -> TrendReq:
         """
         Create a new pytrends client instance
@@ -50,12 +883,13 @@ class GoogleTrendsService:
         Returns:
             TrendReq: Configured pytrends client
         """
-        return TrendReq(
+        return _SessionTrendReq(
             hl='en-NG',  # English (Nigeria)
             tz=60,  # WAT (West Africa Time, UTC+1)
             timeout=(self.timeout, self.timeout),
-            retries=self.max_retries,
-            backoff_factor=0.5
+            # Retries are handled per call in _call, which knows the status code
+            retries=0,
+            backoff_factor=0
         )
 
     async def get_trending_searches(self, region: str = "NG", limit: int = 20) -> List[Dict[str, Any]]:
@@ -82,277 +916,226 @@ class GoogleTrendsService:
         Returns:
             List of trending search terms from across Nigeria
         """
-        try:
-            logger.info(f"Fetching comprehensive trending searches for {region}")
-
-            loop = asyncio.get_event_loop()
-            pytrends = self._get_pytrends_client()
-            
-            all_trending_data = []
-            seen_terms = set()
+        return await self._cached(
+            "trending",
+            (region, limit),
+            lambda: self._with_client(self._fetch_trending_searches, region, limit)
+        )
 
-            # Method 1: Realtime trending stories
-            try:
-                logger.info("Method 1: Fetching realtime trending stories...")
-                trending_stories = await loop.run_in_executor(
-                    None,
-                    lambda: pytrends.realtime_trending_searches(pn=region)
-                )
-                
-                if trending_stories and not trending_stories.empty:
-                    for _, story in trending_stories.iterrows():
-                        title = story.get('title', '')
-                        if title and title not in seen_terms:
-                            all_trending_data.append({
-                                "term": title,
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "region": region,
-                                "source": "realtime_stories",
-                                "traffic": story.get('traffic', 'Unknown')
-                            })
-                            seen_terms.add(title)
-                    
-                    logger.info(f"✅ Got {len([d for d in all_trending_data if d['source'] == 'realtime_stories'])} from realtime stories")
-
-            except Exception as e:
-                logger.warning(f"Method 1 failed: {e}")
-
-            # Method 2: Comprehensive rising queries from multiple Nigerian topics
-            try:
-                logger.info("Method 2: Fetching rising queries from Nigerian topics...")
-                
-                # Expanded keywords covering news, states, politics, economy
-                nigerian_keywords = [
-                    # Batch 1: National topics
-                    ["Nigeria news", "Nigerian", "Nigeria today", "Lagos",  "Abuja"],
-                    # Batch 2: Trending topics
-                    ["Nigerian politics", "Nigeria economy", "Naira", "Nigeria football", "Nigerian music"]
-                ]
-                
-                # Process in batches (API limit is 5 keywords)
-                for batch_idx, batch in enumerate(nigerian_keywords, 1):
-                    try:
-                        # Define the build function separately to avoid lambda issues
-                        def build_for_batch():
-                            pytrends.build_payload(
-                                batch,
-                                cat=0,
-                                timeframe='now 7-d',  # Last week for better data
-                                geo=region,
-                                gprop=''
-                            )
-                        
-                        await loop.run_in_executor(None, build_for_batch)
-                        
-                        related_dict = await loop.run_in_executor(
-                            None,
-                            pytrends.related_queries
-                        )
-                        
-                        # Extract rising queries
-                        for keyword in batch:
-                            if keyword in related_dict:
-                                # Get rising queries
-                                if related_dict[keyword]['rising'] is not None:
-                                    rising_df = related_dict[keyword]['rising']
-                                    for _, row in rising_df.head(10).iterrows():  # Get top 10 per keyword
-                                        query = row['query']
-                                        # Filter for meaningful terms (not just single words like "weather")
-                                        if query and query not in seen_terms and len(query.split()) >= 2:
-                                            all_trending_data.append({
-                                                "term": query,
-                                                "timestamp": datetime.utcnow().isoformat(),
-                                                "region": region,
-                                                "source": "rising_queries",
-                                                "growth": row.get('value', 'Rising'),
-                                                "parent_keyword": keyword
-                                            })
-                                            seen_terms.add(query)
-                                
-                                # Also get top queries for context
-                                if related_dict[keyword]['top'] is not None:
-                                    top_df = related_dict[keyword]['top']
-                                    for _, row in top_df.head(5).iterrows():  # Get top 5 per keyword
-                                        query = row['query']
-                                        if query and query not in seen_terms and len(query.split()) >= 2:
-                                            all_trending_data.append({
-                                                "term": query,
-                                                "timestamp": datetime.utcnow().isoformat(),
-                                                "region": region,
-                                                "source": "top_queries",
-                                                "relevance": row.get('value', 0),
-                                                "parent_keyword": keyword
-                                            })
-                                            seen_terms.add(query)
-                        
-                        # Rate limiting between batches
-                        if batch_idx < len(nigerian_keywords):
-                            await asyncio.sleep(2)
-                        
-                    except Exception as batch_error:
-                        logger.warning(f"Batch {batch_idx} failed: {batch_error}")
-                        continue
-                
-                logger.info(f"✅ Got {len([d for d in all_trending_data if 'queries' in d['source']])} from related queries")
+    async def _fetch_trending_searches(self, pytrends: TrendReq, region: str, limit: int) -> List[Dict[str, Any]]:
+        """Fetch trending searches from Google Trends (see get_trending_searches)"""
+        # One collection time for every row of this fetch
+        now_iso = _now_iso()
 
-            except Exception as e:
-                logger.warning(f"Method 2 failed: {e}")
+        try:
+            logger.info(f"Fetching comprehensive trending searches for {region}")
 
-            # Method 3:  Traditional trending searches
-            try:
-                logger.info("Method 3: Trying traditional trending_searches...")
-                trending_df = await loop.run_in_executor(
-                    None,
-                    pytrends.trending_searches,
-                    region
-                )
+            # Nigerian topics whose rising/top queries are collected (API limit is 5 keywords)
+            nigerian_keywords = [
+                # Batch 1: National topics
+                ["Nigeria news", "Nigerian", "Nigeria today", "Lagos",  "Abuja"],
+                # Batch 2: Trending topics
+                ["Nigerian politics", "Nigeria economy", "Naira", "Nigeria football", "Nigerian music"]
+            ]
+            suggestion_terms = [
+                "Nigeria", "Nigerian", "Lagos", "Abuja",
+                "Naija", "FCT", "Port Harcourt", "Kano"
+            ]
 
-                if not trending_df.empty:
-                    for term in trending_df[0].tolist()[:20]:
-                        if term and term not in seen_terms:
-                            all_trending_data.append({
-                                "term": term,
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "region": region,
-                                "source": "traditional_api"
-                            })
-                            seen_terms.add(term)
-                    
-                    logger.info(f"✅ Got {len([d for d in all_trending_data if d['source'] == 'traditional_api'])} from traditional API")
-
-            except Exception as e:
-                logger.warning(f"Method 3 failed: {e}")
-
-            # Method 4: Suggestions for multiple Nigerian terms
-            try:
-                logger.info("Method 4: Getting suggestions...")
-                
-                suggestion_terms = [
-                    "Nigeria", "Nigerian", "Lagos", "Abuja",
-                    "Naija", "FCT", "Port Harcourt", "Kano"
-                ]
-                
-                for base_term in suggestion_terms:
-                    try:
-                        suggestions = await loop.run_in_executor(
-                            None,
-                            pytrends.suggestions,
-                            base_term
-                        )
-                        
-                        for suggestion in suggestions:
-                            term = suggestion.get('title', '')
-                            if term and term not in seen_terms and term != base_term:
-                                all_trending_data.append({
-                                    "term": term,
-                                    "timestamp": datetime.utcnow().isoformat(),
-                                    "region": region,
-                                    "source": "suggestions"
-                                })
-                                seen_terms.add(term)
-                        
-                        await asyncio.sleep(1)  # Rate limiting
-                        
-                    except:
-                        continue
-                
-                logger.info(f"✅ Got {len([d for d in all_trending_data if d['source'] == 'suggestions'])} from suggestions")
+            # Run every method concurrently. Rising-query batches each build their
+            # own payload, so they get their own pooled client; the other calls
+            # don't touch payload state and share this one.
+            results = await asyncio.gather(
+                self._fetch_realtime_stories(pytrends, region, now_iso),
+                *(
+                    self._with_client(self._fetch_related_batch, batch, region, now_iso)
+                    for batch in nigerian_keywords
+                ),
+                self._fetch_traditional_trending(pytrends, region, now_iso),
+                *(
+                    self._fetch_suggestion_terms(pytrends, base_term, region, now_iso)
+                    for base_term in suggestion_terms
+                ),
+                return_exceptions=True
+            )
 
-            except Exception as e:
-                logger.warning(f"Method 4 failed: {e}")
+            # Merge in method order, keeping the first occurrence of each term
+            all_trending_data = []
+            seen_terms = set()
+            source_counts = Counter()
+            for rows in results:
+                if isinstance(rows, Exception):
+                    logger.warning(f"Trending method failed: {rows}")
+                    continue
+                for row in rows:
+                    # Case and spacing variants of a term count as the same term
+                    key = _canonical_term(row.term)
+                    if key and key not in seen_terms:
+                        seen_terms.add(key)
+                        all_trending_data.append(row)
+                        source_counts[row.source] += 1
+
+            logger.info(
+                f"✅ Collected {len(all_trending_data)} trending terms: "
+                f"{source_counts['realtime_stories']} from realtime stories, "
+                f"{source_counts['rising_queries'] + source_counts['top_queries']} from related queries, "
+                f"{source_counts['traditional_api']} from traditional API, "
+                f"{source_counts['suggestions']} from suggestions"
+            )
 
             # Rank and return results
             if all_trending_data:
-                # Prioritize by source (realtime > rising > top > traditional > suggestions)
-                source_priority = {
-                    "realtime_stories": 1,
-                    "rising_queries": 2,
-                    "top_queries": 3,
-                    "traditional_api": 4,
-                    "suggestions": 5
-                }
-                
-                # Sort by source priority, then by growth/relevance
-                all_trending_data.sort(
-                    key=lambda x: (
-                        source_priority.get(x['source'], 10),
-                        -(x.get('growth', 0) if isinstance(x.get('growth'), (int, float)) else 0),
-                        -(x.get('relevance', 0))
-                    )
-                )
-                
+                # Top `limit` by source priority, then by growth/relevance
+                # (same order as a full sort, without sorting every candidate)
+                final_trending = heapq.nsmallest(limit, all_trending_data, key=_trending_sort_key)
+
                 # Add rank
-                for idx, item in enumerate(all_trending_data[:limit], 1):
-                    item['rank'] = idx
+                for idx, item in enumerate(final_trending, 1):
+                    item.rank = idx
                 
-                final_trending = all_trending_data[:limit]
-                logger.info(f"🎯 Returning {len(final_trending)} comprehensive trending topics from {len(set(d['source'] for d in final_trending))} sources")
+                logger.info(f"🎯 Returning {len(final_trending)} comprehensive trending topics from {len(set(item.source for item in final_trending))} sources")
                 
-                return final_trending
+                return msgspec.to_builtins(final_trending)
             
             # Fallback: Use curated Nigerian topics covering all states
             logger.warning("All API methods returned no data, using comprehensive curated topics")
             
-            curated_topics = [
-                # National news
-                "Nigeria news today", "Nigerian breaking news", "Nigeria latest news",
-                # Politics & Government
-                "Nigeria president", "Nigerian government", "Nigeria election",
-                # Economy
-                "Naira exchange rate", "Nigeria economy", "CBN Nigeria",
-                # Major cities & states
-                "Lagos news", "Abuja news", "Port Harcourt news", "Kano news",
-                "Ibadan news", "Enugu news", "Kaduna news", "Jos news",
-                # Sports
-                "Nigeria football", "Super Eagles", "Nigerian Premier League",
-                # Entertainment
-                "Nigerian music", "Nollywood", "Afrobeats",
-                # Current affairs
-                "Nigeria security", "Nigerian universities", "ASUU strike"
-            ]
-            
             return [
                 {
                     "term": term,
                     "rank": idx + 1,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": now_iso,
                     "region": region,
                     "source": "curated_comprehensive",
                     "is_fallback": True
                 }
-                for idx, term in enumerate(curated_topics[:limit])
+                for idx, term in enumerate(CURATED_TOPICS[:limit])
             ]
 
         except Exception as e:
             logger.error(f"Critical error: {e}")
             
             # Emergency fallback
-            emergency_topics = [
-                "Nigeria news", "Lagos", "Abuja", "Nigerian politics",
-                "Naira", "Nigeria football", "Nigerian music", "Nigeria today",
-                "Port Harcourt", "Kano", "Ibadan", "Nigeria president",
-                "Nigerian government", "Nigeria economy", "Nollywood",
-                "Super Eagles", "Nigerian universities", "Nigeria security",
-                "Lagos traffic", "Afrobeats"
-            ]
-            
             return [
                 {
                     "term": term,
                     "rank": idx + 1,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": now_iso,
                     "region": region,
                     "source": "emergency_fallback",
                     "is_fallback": True
                 }
-                for idx, term in enumerate(emergency_topics[:limit])
+                for idx, term in enumerate(EMERGENCY_TOPICS[:limit])
             ]
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(ResponseError)
-    )
+    async def _fetch_realtime_stories(self, pytrends: TrendReq, region: str, now_iso: str) -> List[TrendingTerm]:
+        """Method 1: realtime trending stories"""
+        logger.info("Method 1: Fetching realtime trending stories...")
+        trending_stories = await self._call(
+            lambda: pytrends.realtime_trending_searches(pn=region)
+        )
+        if trending_stories is None or trending_stories.empty:
+            return []
+
+        # Read whole columns instead of building a Series per row
+        titles = trending_stories['title'].tolist() if 'title' in trending_stories else []
+        traffic = (
+            trending_stories['traffic'].tolist() if 'traffic' in trending_stories
+            else ['Unknown'] * len(titles)
+        )
+        return [
+            TrendingTerm(
+                term=title,
+                timestamp=now_iso,
+                region=region,
+                source="realtime_stories",
+                traffic=story_traffic
+            )
+            for title, story_traffic in zip(titles, traffic)
+            if title and isinstance(title, str)
+        ]
+
+    async def _fetch_related_batch(
+        self,
+        pytrends: "_SessionTrendReq",
+        batch: List[str],
+        region: str,
+        now_iso: str
+    ) -> List[TrendingTerm]:
+        """Method 2: rising and top queries for one batch of Nigerian topics"""
+        logger.info(f"Method 2: Fetching rising queries for {batch}...")
+        await self._call(
+            lambda: pytrends.build_payload(
+                batch,
+                cat=0,
+                timeframe='now 7-d',  # Last week for better data
+                geo=region,
+                gprop=''
+            )
+        )
+        related_dict = await self._call(pytrends.related_queries_records)
+
+        rows = []
+        for keyword in batch:
+            if keyword not in related_dict:
+                continue
+
+            # Rising queries, top 10 per keyword
+            for item in related_dict[keyword]['rising'][:10]:
+                query = item['query']
+                # Filter for meaningful terms (not just single words like "weather")
+                if query and " " in query.strip():
+                    rows.append(TrendingTerm(
+                        term=query,
+                        timestamp=now_iso,
+                        region=region,
+                        source="rising_queries",
+                        growth=item['value'],
+                        parent_keyword=keyword
+                    ))
+
+            # Top queries for context, top 5 per keyword
+            for item in related_dict[keyword]['top'][:5]:
+                query = item['query']
+                if query and " " in query.strip():
+                    rows.append(TrendingTerm(
+                        term=query,
+                        timestamp=now_iso,
+                        region=region,
+                        source="top_queries",
+                        relevance=item['value'],
+                        parent_keyword=keyword
+                    ))
+        return rows
+
+    async def _fetch_traditional_trending(self, pytrends: TrendReq, region: str, now_iso: str) -> List[TrendingTerm]:
+        """Method 3: traditional trending searches"""
+        logger.info("Method 3: Trying traditional trending_searches...")
+        trending_df = await self._call(pytrends.trending_searches, region)
+        if trending_df.empty:
+            return []
+
+        return [
+            TrendingTerm(term=term, timestamp=now_iso, region=region, source="traditional_api")
+            for term in trending_df[0].tolist()[:20]
+            if term
+        ]
+
+    async def _fetch_suggestion_terms(
+        self,
+        pytrends: TrendReq,
+        base_term: str,
+        region: str,
+        now_iso: str
+    ) -> List[TrendingTerm]:
+        """Method 4: suggestions for one Nigerian term"""
+        suggestions = await self._call(pytrends.suggestions, base_term)
+        return [
+            TrendingTerm(term=suggestion['title'], timestamp=now_iso, region=region, source="suggestions")
+            for suggestion in suggestions
+            if suggestion.get('title', '') and suggestion.get('title') != base_term
+        ]
+
     async def get_interest_over_time(
         self,
         keywords: List[str],
@@ -362,28 +1145,64 @@ class GoogleTrendsService:
         """
         Get interest over time for specific keywords in Nigeria
 
+        More than 5 keywords are split into batches of 5 that are fetched
+        concurrently and merged by date. Google scales each batch to its own
+        peak, so values are only comparable within a batch.
+
         Args:
-            keywords: List of keywords to track (max 5)
+            keywords: List of keywords to track
             timeframe: Time period (e.g., 'today 3-m', 'today 12-m', 'now 7-d')
             geo: Geographic region (default: NG)
 
         Returns:
             Dictionary with time series data and metadata
         """
+        if len(keywords) <= PAYLOAD_KEYWORD_LIMIT:
+            return await self._interest_over_time_batch(keywords, timeframe, geo)
+
+        results = await asyncio.gather(*(
+            self._interest_over_time_batch(batch, timeframe, geo)
+            for batch in _chunks(keywords)
+        ))
+
+        merged = {
+            "keywords": keywords,
+            "data": _merge_by_date(results),
+            "timeframe": timeframe,
+            "geo": geo,
+            "timestamp": _now_iso()
+        }
+        errors = [result["error"] for result in results if "error" in result]
+        if errors:
+            merged["error"] = "; ".join(errors)
+        return merged
+
+    async def _interest_over_time_batch(
+        self,
+        keywords: List[str],
+        timeframe: str,
+        geo: str
+    ) -> Dict[str, Any]:
+        """Interest over time for up to 5 keywords, through the response cache"""
+        return await self._cached(
+            "interest_over_time",
+            (tuple(keywords), timeframe, geo),
+            lambda: self._with_client(self._fetch_interest_over_time, keywords, timeframe, geo)
+        )
+
+    async def _fetch_interest_over_time(
+        self,
+        pytrends: "_SessionTrendReq",
+        keywords: List[str],
+        timeframe: str,
+        geo: str
+    ) -> Dict[str, Any]:
+        """Fetch interest over time from Google Trends (see get_interest_over_time)"""
         try:
             logger.info(f"Fetching interest over time for: {keywords}")
 
-            # Limit to 5 keywords (API restriction)
-            if len(keywords) > 5:
-                keywords = keywords[:5]
-                logger.warning("Limited to 5 keywords due to API restrictions")
-
-            loop = asyncio.get_event_loop()
-            pytrends = self._get_pytrends_client()
-
             # Build payload
-            await loop.run_in_executor(
-                None,
+            await self._call(
                 lambda: pytrends.build_payload(
                     keywords,
                     cat=0,
@@ -393,34 +1212,20 @@ class GoogleTrendsService:
                 )
             )
 
-            # Get interest over time
-            interest_df = await loop.run_in_executor(
-                None,
-                pytrends.interest_over_time
+            # Get interest over time, already in dictionary format
+            data = await self._call(
+                pytrends.interest_over_time_records
             )
 
-            if interest_df.empty:
+            if not data:
                 return {"keywords": keywords, "data": [], "timeframe": timeframe}
 
-            # Remove 'isPartial' column if exists
-            if 'isPartial' in interest_df.columns:
-                interest_df = interest_df.drop(columns=['isPartial'])
-
-            # Transform to dictionary format
-            data = []
-            for date, row in interest_df.iterrows():
-                data_point = {
-                    "date": date.isoformat(),
-                    "values": {kw: int(row[kw]) for kw in keywords if kw in row}
-                }
-                data.append(data_point)
-
             result = {
                 "keywords": keywords,
                 "data": data,
                 "timeframe": timeframe,
                 "geo": geo,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             }
 
             logger.info(f"Retrieved {len(data)} data points")
@@ -430,11 +1235,30 @@ class GoogleTrendsService:
             logger.error(f"Error fetching interest over time: {e}")
             return {"keywords": keywords, "data": [], "error": str(e)}
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(ResponseError)
-    )
+    async def aiter_interest_over_time(
+        self,
+        keywords: List[str],
+        timeframe: str = "today 3-m",
+        geo: str = "NG"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate interest over time one data point at a time
+
+        Lets callers stream points (e.g. as NDJSON) or stop after a prefix.
+        Nothing is yielded when the lookup fails.
+
+        Args:
+            keywords: List of keywords to track
+            timeframe: Time range
+            geo: Geographic region (default: NG)
+
+        Yields:
+            {"date": ..., "values": {keyword: interest}} per point
+        """
+        result = await self.get_interest_over_time(keywords, timeframe=timeframe, geo=geo)
+        for point in result["data"]:
+            yield point
+
     async def get_related_queries(
         self,
         keyword: str,
@@ -450,15 +1274,19 @@ class GoogleTrendsService:
         Returns:
             Dictionary with top and rising related queries
         """
+        return await self._cached(
+            "related_queries",
+            (keyword, geo),
+            lambda: self._with_client(self._fetch_related_queries, keyword, geo)
+        )
+
+    async def _fetch_related_queries(self, pytrends: "_SessionTrendReq", keyword: str, geo: str) -> Dict[str, Any]:
+        """Fetch related queries from Google Trends (see get_related_queries)"""
         try:
             logger.info(f"Fetching related queries for: {keyword}")
 
-            loop = asyncio.get_event_loop()
-            pytrends = self._get_pytrends_client()
-
             # Build payload
-            await loop.run_in_executor(
-                None,
+            await self._call(
                 lambda: pytrends.build_payload(
                     [keyword],
                     cat=0,
@@ -468,10 +1296,9 @@ class GoogleTrendsService:
                 )
             )
 
-            # Get related queries
-            related_dict = await loop.run_in_executor(
-                None,
-                pytrends.related_queries
+            # Get related queries, already in dictionary format
+            related_dict = await self._call(
+                pytrends.related_queries_records
             )
 
             # Transform the data
@@ -480,28 +1307,12 @@ class GoogleTrendsService:
                 "geo": geo,
                 "top_queries": [],
                 "rising_queries": [],
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             }
 
             if keyword in related_dict:
-                # Process top queries
-                if related_dict[keyword]['top'] is not None:
-                    top_df = related_dict[keyword]['top']
-                    result['top_queries'] = [
-                        {"query": row['query'], "value": int(row['value'])}
-                        for _, row in top_df.iterrows()
-                    ]
-
-                # Process rising queries
-                if related_dict[keyword]['rising'] is not None:
-                    rising_df = related_dict[keyword]['rising']
-                    result['rising_queries'] = [
-                        {
-                            "query": row['query'],
-                            "value": row['value'] if pd.notna(row['value']) else "Breakout"
-                        }
-                        for _, row in rising_df.iterrows()
-                    ]
+                result['top_queries'] = related_dict[keyword]['top']
+                result['rising_queries'] = related_dict[keyword]['rising']
 
             logger.info(f"Retrieved {len(result['top_queries'])} top and "
                        f"{len(result['rising_queries'])} rising queries")
@@ -511,11 +1322,6 @@ class GoogleTrendsService:
             logger.error(f"Error fetching related queries: {e}")
             return {"keyword": keyword, "top_queries": [], "rising_queries": [], "error": str(e)}
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(ResponseError)
-    )
     async def get_regional_interest(
         self,
         keyword: str,
@@ -531,15 +1337,19 @@ class GoogleTrendsService:
         Returns:
             Dictionary with regional interest data
         """
+        return await self._cached(
+            "regional_interest",
+            (keyword, resolution),
+            lambda: self._with_client(self._fetch_regional_interest, keyword, resolution)
+        )
+
+    async def _fetch_regional_interest(self, pytrends: "_SessionTrendReq", keyword: str, resolution: str) -> Dict[str, Any]:
+        """Fetch regional interest from Google Trends (see get_regional_interest)"""
         try:
             logger.info(f"Fetching regional interest for: {keyword}")
 
-            loop = asyncio.get_event_loop()
-            pytrends = self._get_pytrends_client()
-
             # Build payload
-            await loop.run_in_executor(
-                None,
+            await self._call(
                 lambda: pytrends.build_payload(
                     [keyword],
                     cat=0,
@@ -550,32 +1360,24 @@ class GoogleTrendsService:
             )
 
             # Get regional interest
-            regional_df = await loop.run_in_executor(
-                None,
-                lambda: pytrends.interest_by_region(
+            regions = await self._call(
+                lambda: pytrends.interest_by_region_records(
                     resolution=resolution,
-                    inc_low_vol=True,
-                    inc_geo_code=True
+                    inc_low_vol=True
                 )
             )
 
-            # Transform to list of dictionaries
-            regional_data = []
-            if not regional_df.empty:
-                for location, row in regional_df.iterrows():
-                    regional_data.append({
-                        "location": location,
-                        "interest": int(row[keyword]) if keyword in row else 0
-                    })
-
-                # Sort by interest
-                regional_data.sort(key=lambda x: x['interest'], reverse=True)
+            # Transform to list of dictionaries, sorted by interest (ties by name)
+            regional_data = [
+                {"location": location, "interest": interest}
+                for location, interest in sorted(regions, key=lambda region: -region[1])
+            ]
 
             result = {
                 "keyword": keyword,
                 "resolution": resolution,
                 "regions": regional_data,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             }
 
             logger.info(f"Retrieved interest data for {len(regional_data)} regions")
@@ -585,6 +1387,27 @@ class GoogleTrendsService:
             logger.error(f"Error fetching regional interest: {e}")
             return {"keyword": keyword, "regions": [], "error": str(e)}
 
+    async def aiter_regional_interest(
+        self,
+        keyword: str,
+        resolution: str = "REGION"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate regional interest from the highest-interest region down
+
+        Nothing is yielded when the lookup fails.
+
+        Args:
+            keyword: Keyword to analyze
+            resolution: 'REGION' for states, 'CITY' for cities
+
+        Yields:
+            {"location": ..., "interest": ...} per region
+        """
+        result = await self.get_regional_interest(keyword, resolution=resolution)
+        for region in result["regions"]:
+            yield region
+
     async def get_suggestions(self, keyword: str) -> List[str]:
         """
         Get keyword suggestions based on partial input
@@ -595,14 +1418,18 @@ class GoogleTrendsService:
         Returns:
             List of suggested keywords
         """
+        return await self._cached(
+            "suggestions",
+            (keyword,),
+            lambda: self._with_client(self._fetch_suggestions, keyword)
+        )
+
+    async def _fetch_suggestions(self, pytrends: TrendReq, keyword: str) -> List[str]:
+        """Fetch keyword suggestions from Google Trends (see get_suggestions)"""
         try:
             logger.info(f"Fetching suggestions for: {keyword}")
 
-            loop = asyncio.get_event_loop()
-            pytrends = self._get_pytrends_client()
-
-            suggestions = await loop.run_in_executor(
-                None,
+            suggestions = await self._call(
                 pytrends.suggestions,
                 keyword
             )
@@ -632,10 +1459,10 @@ class GoogleTrendsService:
         Returns:
             Transformed data matching pipeline schema
         """
-        transformed = []
+        now_iso = _now_iso()
 
-        for item in trends_data:
-            transformed_item = {
+        return [
+            {
                 "source": "google_trends",
                 "source_id": f"gt_{item.get('term', '')}_{item.get('timestamp', '')}",
                 "content": item.get('term', ''),
@@ -646,12 +1473,71 @@ class GoogleTrendsService:
                     "interest_value": item.get('interest'),
                     "related_queries": item.get('related_queries', [])
                 },
-                "collected_at": item.get('timestamp', datetime.utcnow().isoformat()),
+                "collected_at": item.get('timestamp', now_iso),
                 "geo_location": "Nigeria"
             }
-            transformed.append(transformed_item)
+            for item in trends_data
+        ]
+
+    def transform_stream(
+        self,
+        trends_data: Iterable[Dict[str, Any]],
+        data_type: str = "trending"
+    ) -> Iterator[TrendsRecord]:
+        """
+        Lazily transform Google Trends data into typed pipeline records
+
+        Same schema as transform_to_social_media_format, for bulk consumers
+        that don't need plain dicts (msgspec.to_builtins converts a record back).
+
+        Args:
+            trends_data: Raw trends data (any iterable, consumed lazily)
+            data_type: Type of data (trending, interest, regional)
+
+        Yields:
+            TrendsRecord for each item
+        """
+        now_iso = _now_iso()
 
-        return transformed
+        for item in trends_data:
+            term = item.get('term', '')
+            yield TrendsRecord(
+                source="google_trends",
+                source_id=f"gt_{term}_{item.get('timestamp', '')}",
+                content=term,
+                data_type=data_type,
+                metadata=TrendsMetadata(
+                    rank=item.get('rank'),
+                    region=item.get('region', 'NG'),
+                    interest_value=item.get('interest'),
+                    related_queries=item.get('related_queries', [])
+                ),
+                collected_at=item.get('timestamp', now_iso),
+                geo_location="Nigeria"
+            )
+
+    def transform_to_social_media_bytes(
+        self,
+        trends_data: List[Dict[str, Any]],
+        data_type: str = "trending"
+    ) -> bytes:
+        """
+        Transform Google Trends data straight to pipeline-format JSON
+
+        Same records as transform_to_social_media_format, encoded with orjson
+        for callers that write or return JSON directly.
+
+        Args:
+            trends_data: Raw trends data
+            data_type: Type of data (trending, interest, regional)
+
+        Returns:
+            JSON array of pipeline records, as bytes
+        """
+        return orjson.dumps(
+            self.transform_to_social_media_format(trends_data, data_type),
+            option=ORJSON_OPTIONS
+        )
 
     async def get_comprehensive_analysis(
         self,
@@ -678,28 +1564,37 @@ class GoogleTrendsService:
                 "interest_over_time": None,
                 "related_data": [],
                 "regional_data": [],
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             }
 
             # Get interest over time for all keywords
             results["interest_over_time"] = await self.get_interest_over_time(keywords)
 
-            # Get related and regional data for each keyword
-            if include_related or include_regional:
-                for keyword in keywords:
-                    if include_related:
-                        related = await self.get_related_queries(keyword)
-                        results["related_data"].append(related)
+            # Get related and regional data for all keywords concurrently,
+            # bounded so only a few requests are in flight at once
+            semaphore = asyncio.Semaphore(settings.GT_CONCURRENCY)
 
-                        # Rate limiting
-                        await asyncio.sleep(1)
+            async def limited(fetch, keyword: str):
+                async with semaphore:
+                    return await fetch(keyword)
 
-                    if include_regional:
-                        regional = await self.get_regional_interest(keyword)
-                        results["regional_data"].append(regional)
+            fetches = []
+            if include_related:
+                fetches.append(("related_data", self.get_related_queries))
+            if include_regional:
+                fetches.append(("regional_data", self.get_regional_interest))
 
-                        # Rate limiting
-                        await asyncio.sleep(1)
+            gathered = await asyncio.gather(
+                *(limited(fetch, keyword) for _, fetch in fetches for keyword in keywords),
+                return_exceptions=True
+            )
+
+            for index, (field, _) in enumerate(fetches):
+                for keyword, outcome in zip(keywords, gathered[index * len(keywords):]):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Error fetching {field} for {keyword}: {outcome}")
+                        outcome = {"keyword": keyword, "error": str(outcome)}
+                    results[field].append(outcome)
 
             logger.info("Comprehensive analysis completed")
             return results
@@ -711,11 +1606,23 @@ class GoogleTrendsService:
 
 # Singleton instance
 _google_trends_service = None
+_google_trends_service_lock = threading.Lock()
 
 
 def get_google_trends_service() -> GoogleTrendsService:
     """Get or create Google Trends service instance"""
     global _google_trends_service
     if _google_trends_service is None:
-        _google_trends_service = GoogleTrendsService()
+        with _google_trends_service_lock:
+            if _google_trends_service is None:
+                _google_trends_service = GoogleTrendsService()
     return _google_trends_service
+
+
+def close_google_trends_service():
+    """Close the Google Trends service instance if one was created"""
+    global _google_trends_service
+    with _google_trends_service_lock:
+        if _google_trends_service is not None:
+            _google_trends_service.close()
+            _google_trends_service = None
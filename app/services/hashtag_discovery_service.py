@@ -8,14 +8,69 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from collections import Counter
 import re
+import string
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, cast, case, BigInteger
+from sqlalchemy.dialects.postgresql import JSONB
+from cachetools import TTLCache
 import asyncio
+import heapq
 
 from app.models.social_media_sources import ApifyScrapedData, TikTokContent, FacebookContent
+from app.services.cache_service import get_cache_service
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Category keywords for filtering hashtags
+CATEGORY_KEYWORDS = {
+    'politics': ['politic', 'government', 'election', 'tinubu', 'apc', 'pdp', 'inec'],
+    'entertainment': ['music', 'movie', 'nollywood', 'afrobeat', 'bbnaija', 'celeb'],
+    'sports': ['football', 'soccer', 'eagles', 'sport', 'afcon', 'osimhen'],
+    'economy': ['naira', 'dollar', 'fuel', 'price', 'economy', 'business'],
+    'tech': ['tech', 'startup', 'innovation', 'fintech', 'digital'],
+    'security': ['security', 'police', 'military', 'crime', 'safety'],
+    'education': ['education', 'school', 'university', 'asuu', 'student'],
+}
+
+# Each category's keywords as one compiled alternation, matched against lowercased tags
+CATEGORY_PATTERNS = {
+    category: re.compile('|'.join(map(re.escape, keywords)))
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+
+# str.translate table dropping every ASCII character that can't appear in a hashtag
+_HASHTAG_DROP_TABLE = {
+    code: None for code in range(128)
+    if chr(code) not in string.ascii_lowercase + string.digits
+}
+
+# Google Trends topics per (region, limit); trending searches change slowly
+_google_topics_cache = TTLCache(maxsize=32, ttl=600)
+
+
+def _fetch_google_trending_searches():
+    """Fetch Nigeria's trending searches with pytrends (blocking, run in a thread)"""
+    from pytrends.request import TrendReq
+
+    pytrends = TrendReq(hl='en-NG', tz=60)
+    return pytrends.trending_searches(pn='nigeria')
+
+
+def _metric_value(name: str):
+    """
+    One engagement metric of a scraped post as a SQL integer
+
+    Values that aren't JSON numbers (missing, null, strings like "1.2K")
+    count as 0 instead of failing the cast, and fractional counts are
+    rounded, so sums match integer arithmetic in Python.
+    """
+    value = ApifyScrapedData.metrics_json[name]
+    return case(
+        (func.json_typeof(value) == 'number', cast(func.round(value.as_float()), BigInteger)),
+        else_=0
+    )
+
 
 class HashtagDiscoveryService:
     """
@@ -35,16 +90,18 @@ class HashtagDiscoveryService:
         """
         Get trending topics from Google Trends for Nigeria
 
+        Results are kept in memory for 10 minutes.
+
         Returns:
             List of trending search terms
         """
-        try:
-            from pytrends.request import TrendReq
-
-            pytrends = TrendReq(hl='en-NG', tz=60)
+        cached = _google_topics_cache.get((region, limit))
+        if cached is not None:
+            return list(cached)
 
-            # Get trending searches for Nigeria
-            trending_searches = pytrends.trending_searches(pn='nigeria')
+        try:
+            # Get trending searches for Nigeria; pytrends blocks, so keep it off the event loop
+            trending_searches = await asyncio.to_thread(_fetch_google_trending_searches)
 
             if trending_searches is not None and not trending_searches.empty:
                 # Convert to hashtag format (lowercase, no spaces)
@@ -56,7 +113,8 @@ class HashtagDiscoveryService:
                         hashtags.append(hashtag)
 
                 logger.info(f"Found {len(hashtags)} trending topics from Google Trends")
-                return hashtags
+                _google_topics_cache[(region, limit)] = hashtags
+                return list(hashtags)
 
             return []
 
@@ -84,72 +142,58 @@ class HashtagDiscoveryService:
         try:
             cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
 
-            # Get hashtags from Apify data (Twitter, TikTok, Facebook)
-            query = select(
-                ApifyScrapedData.hashtags,
-                ApifyScrapedData.metrics_json,
+            # Count hashtag occurrences and engagement in the database: each
+            # post's hashtag array is unnested to one row per tag, so only the
+            # aggregated tags come back (Twitter, TikTok, Facebook)
+            engagement = (
+                _metric_value('likes') +
+                _metric_value('comments') +
+                _metric_value('shares') +
+                _metric_value('retweets') +
+                _metric_value('views') // 100  # Scale down views
+            )
+
+            tagged = select(
+                func.lower(func.json_array_elements_text(ApifyScrapedData.hashtags)).label('tag'),
+                engagement.label('engagement'),
                 ApifyScrapedData.collected_at
             ).where(
-                ApifyScrapedData.collected_at >= cutoff_time
-            )
+                ApifyScrapedData.collected_at >= cutoff_time,
+                func.json_typeof(ApifyScrapedData.hashtags) == 'array'
+            ).subquery()
+
+            count = func.count()
+            total_engagement = func.coalesce(func.sum(tagged.c.engagement), 0)
+
+            # Trend score: combination of count and engagement
+            query = select(
+                tagged.c.tag,
+                count.label('count'),
+                total_engagement.label('total_engagement'),
+                func.max(tagged.c.collected_at).label('last_seen')
+            ).group_by(
+                tagged.c.tag
+            ).having(
+                count >= min_occurrences
+            ).order_by(
+                desc(count * 10 + total_engagement / 1000)
+            ).limit(limit)
 
             result = await self.db.execute(query)
-            records = result.all()
-
-            # Count hashtag occurrences and engagement
-            hashtag_stats = {}
-
-            for hashtags, metrics, collected_at in records:
-                if not hashtags:
-                    continue
-
-                for tag in hashtags:
-                    tag_lower = tag.lower()
-
-                    if tag_lower not in hashtag_stats:
-                        hashtag_stats[tag_lower] = {
-                            'count': 0,
-                            'total_engagement': 0,
-                            'last_seen': collected_at,
-                            'platforms': set()
-                        }
-
-                    hashtag_stats[tag_lower]['count'] += 1
-
-                    # Add engagement metrics
-                    if metrics:
-                        engagement = (
-                            metrics.get('likes', 0) +
-                            metrics.get('comments', 0) +
-                            metrics.get('shares', 0) +
-                            metrics.get('retweets', 0) +
-                            metrics.get('views', 0) // 100  # Scale down views
-                        )
-                        hashtag_stats[tag_lower]['total_engagement'] += engagement
-
-                    if collected_at > hashtag_stats[tag_lower]['last_seen']:
-                        hashtag_stats[tag_lower]['last_seen'] = collected_at
-
-            # Filter and sort by engagement and count
+
             trending = []
-            for tag, stats in hashtag_stats.items():
-                if stats['count'] >= min_occurrences:
-                    # Calculate trend score (combination of count and engagement)
-                    trend_score = (stats['count'] * 10) + (stats['total_engagement'] / 1000)
-
-                    trending.append({
-                        'hashtag': tag,
-                        'count': stats['count'],
-                        'total_engagement': stats['total_engagement'],
-                        'trend_score': trend_score,
-                        'last_seen': stats['last_seen']
-                    })
-
-            # Sort by trend score
-            trending.sort(key=lambda x: x['trend_score'], reverse=True)
+            for tag, tag_count, tag_engagement, last_seen in result.all():
+                tag_engagement = int(tag_engagement)
+                trending.append({
+                    'hashtag': tag,
+                    'count': tag_count,
+                    'total_engagement': tag_engagement,
+                    'trend_score': (tag_count * 10) + (tag_engagement / 1000),
+                    'last_seen': last_seen
+                })
 
             logger.info(f"Found {len(trending)} trending hashtags from collected content")
-            return trending[:limit]
+            return trending
 
         except Exception as e:
             logger.error(f"Error extracting trending hashtags: {e}")
@@ -159,42 +203,67 @@ class HashtagDiscoveryService:
         self,
         include_google_trends: bool = True,
         include_collected: bool = True,
-        limit: int = 50
+        limit: int = 50,
+        use_cache: bool = True
     ) -> List[str]:
         """
         Discover currently trending Nigerian hashtags from all sources
 
+        Results are cached in Redis for CACHE_TTL_MEDIUM seconds.
+
         Args:
             include_google_trends: Include Google Trends data
             include_collected: Include analysis of collected content
             limit: Maximum hashtags to return
+            use_cache: Return a cached result when there is one (a fresh
+                result is cached either way)
 
         Returns:
             List of trending hashtags
         """
-        all_hashtags = []
+        cache_service = get_cache_service()
+        cache_key = f"hashtags:trending:{include_google_trends}:{include_collected}:{limit}"
+
+        if use_cache:
+            cached = await cache_service.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self._score_hashtags(include_google_trends, include_collected, limit)
+        await cache_service.set(cache_key, result, ttl=settings.CACHE_TTL_MEDIUM)
+        return result
+
+    async def _score_hashtags(
+        self,
+        include_google_trends: bool,
+        include_collected: bool,
+        limit: int
+    ) -> List[str]:
+        """Score hashtags from every source (see discover_nigerian_hashtags)"""
         hashtag_scores = {}
 
-        # 1. Get from Google Trends
-        if include_google_trends:
-            google_hashtags = await self.get_trending_google_topics(limit=30)
-            for tag in google_hashtags:
-                hashtag_scores[tag] = hashtag_scores.get(tag, 0) + 100  # High weight for Google Trends
-                all_hashtags.append(tag)
+        async def no_results() -> list:
+            return []
 
-        # 2. Get from collected content
-        if include_collected:
-            trending_data = await self.get_trending_from_collected_content(
+        # Google Trends and the database are independent, so query them concurrently
+        google_hashtags, trending_data = await asyncio.gather(
+            self.get_trending_google_topics(limit=30) if include_google_trends else no_results(),
+            self.get_trending_from_collected_content(
                 hours_back=24,
                 min_occurrences=3,
                 limit=50
-            )
+            ) if include_collected else no_results()
+        )
 
-            for item in trending_data:
-                tag = item['hashtag']
-                score = item['trend_score']
-                hashtag_scores[tag] = hashtag_scores.get(tag, 0) + score
-                all_hashtags.append(tag)
+        # 1. Score Google Trends topics
+        for tag in google_hashtags:
+            hashtag_scores[tag] = hashtag_scores.get(tag, 0) + 100  # High weight for Google Trends
+
+        # 2. Score collected content
+        for item in trending_data:
+            tag = item['hashtag']
+            score = item['trend_score']
+            hashtag_scores[tag] = hashtag_scores.get(tag, 0) + score
 
         # 3. Add core Nigerian hashtags (always include these)
         core_hashtags = [
@@ -204,17 +273,11 @@ class HashtagDiscoveryService:
         for tag in core_hashtags:
             if tag not in hashtag_scores:
                 hashtag_scores[tag] = 50  # Medium weight for core tags
-                all_hashtags.append(tag)
-
-        # Sort by score and remove duplicates
-        unique_hashtags = list(set(all_hashtags))
-        sorted_hashtags = sorted(
-            unique_hashtags,
-            key=lambda x: hashtag_scores.get(x, 0),
-            reverse=True
-        )
 
-        result = sorted_hashtags[:limit]
+        # hashtag_scores is already deduplicated; ties keep first-seen order
+        top_hashtags = heapq.nlargest(limit, hashtag_scores.items(), key=lambda kv: kv[1])
+
+        result = [tag for tag, _ in top_hashtags]
         logger.info(f"Discovered {len(result)} trending Nigerian hashtags")
 
         return result
@@ -234,29 +297,36 @@ class HashtagDiscoveryService:
         Returns:
             List of category-specific hashtags
         """
-        # Category keywords for filtering
-        category_keywords = {
-            'politics': ['politic', 'government', 'election', 'tinubu', 'apc', 'pdp', 'inec'],
-            'entertainment': ['music', 'movie', 'nollywood', 'afrobeat', 'bbnaija', 'celeb'],
-            'sports': ['football', 'soccer', 'eagles', 'sport', 'afcon', 'osimhen'],
-            'economy': ['naira', 'dollar', 'fuel', 'price', 'economy', 'business'],
-            'tech': ['tech', 'startup', 'innovation', 'fintech', 'digital'],
-            'security': ['security', 'police', 'military', 'crime', 'safety'],
-            'education': ['education', 'school', 'university', 'asuu', 'student'],
-        }
-
-        keywords = category_keywords.get(category.lower(), [])
-        if not keywords:
+        if category.lower() not in CATEGORY_KEYWORDS:
             return await self.discover_nigerian_hashtags(limit=limit)
 
         # Get all trending hashtags
         all_trending = await self.discover_nigerian_hashtags(limit=100)
 
-        # Filter by category keywords
-        category_hashtags = []
-        for tag in all_trending:
-            if any(keyword in tag.lower() for keyword in keywords):
-                category_hashtags.append(tag)
+        return self._filter_by_category(all_trending, category, limit)
+
+    def _filter_by_category(
+        self,
+        hashtags: List[str],
+        category: str,
+        limit: int
+    ) -> List[str]:
+        """
+        Pick the hashtags matching a category's keywords
+
+        Args:
+            hashtags: Hashtags to filter, in ranked order
+            category: Category name (a key of CATEGORY_KEYWORDS)
+            limit: Maximum hashtags to return
+
+        Returns:
+            Matching hashtags, in their original order
+        """
+        pattern = CATEGORY_PATTERNS.get(category.lower())
+        if pattern is None:
+            return []
+
+        category_hashtags = [tag for tag in hashtags if pattern.search(tag.lower())]
 
         return category_hashtags[:limit]
 
@@ -278,36 +348,40 @@ class HashtagDiscoveryService:
         try:
             cutoff_time = datetime.utcnow() - timedelta(hours=hours_back)
 
-            # Query posts with this hashtag
+            # Sum the metrics in the database so only one row comes back
+            metrics = ApifyScrapedData.metrics_json
+
+            def metric_sum(name: str):
+                return func.coalesce(func.sum(_metric_value(name)), 0)
+
             query = select(
-                ApifyScrapedData.metrics_json,
-                ApifyScrapedData.platform
+                metric_sum('likes'),
+                metric_sum('comments'),
+                metric_sum('shares'),
+                metric_sum('views'),
+                func.count(),
+                # Posts saved without metrics hold JSON null, not SQL NULL
+                func.array_agg(func.distinct(ApifyScrapedData.platform)).filter(
+                    func.json_typeof(metrics) == 'object'
+                )
             ).where(
-                ApifyScrapedData.hashtags.contains([hashtag.lower()]),
+                # hashtags is plain JSON; as JSONB, @> can use idx_apify_hashtags_gin
+                cast(ApifyScrapedData.hashtags, JSONB).contains([hashtag.lower()]),
                 ApifyScrapedData.collected_at >= cutoff_time
             )
 
             result = await self.db.execute(query)
-            records = result.all()
+            likes, comments, shares, views, posts_count, platforms = result.one()
 
             total_engagement = {
-                'likes': 0,
-                'comments': 0,
-                'shares': 0,
-                'views': 0,
-                'posts_count': len(records),
-                'platforms': set()
+                'likes': int(likes),
+                'comments': int(comments),
+                'shares': int(shares),
+                'views': int(views),
+                'posts_count': posts_count,
+                'platforms': platforms or []
             }
 
-            for metrics, platform in records:
-                if metrics:
-                    total_engagement['likes'] += metrics.get('likes', 0)
-                    total_engagement['comments'] += metrics.get('comments', 0)
-                    total_engagement['shares'] += metrics.get('shares', 0)
-                    total_engagement['views'] += metrics.get('views', 0)
-                    total_engagement['platforms'].add(platform)
-
-            total_engagement['platforms'] = list(total_engagement['platforms'])
             total_engagement['total_engagement'] = (
                 total_engagement['likes'] +
                 total_engagement['comments'] +
@@ -341,11 +415,9 @@ class HashtagDiscoveryService:
         if not term:
             return None
 
-        # Remove special characters, keep only alphanumeric
-        cleaned = re.sub(r'[^a-zA-Z0-9\s]', '', term)
-
-        # Remove spaces and convert to lowercase
-        hashtag = cleaned.replace(' ', '').lower()
+        # Lowercase, then keep only ASCII letters and digits (spaces and
+        # special characters are dropped)
+        hashtag = term.lower().encode('ascii', 'ignore').decode('ascii').translate(_HASHTAG_DROP_TABLE)
 
         # Filter out very short hashtags
         if len(hashtag) < 3:
@@ -361,12 +433,16 @@ class HashtagDiscoveryService:
             Dictionary with trending hashtags by category
         """
         try:
+            # Score every source once, refreshing the cached list, and slice
+            # the categories out of it
+            all_trending = await self.discover_nigerian_hashtags(limit=100, use_cache=False)
+
             trending_cache = {
-                'all': await self.discover_nigerian_hashtags(limit=50),
-                'politics': await self.get_hashtags_by_category('politics', limit=20),
-                'entertainment': await self.get_hashtags_by_category('entertainment', limit=20),
-                'sports': await self.get_hashtags_by_category('sports', limit=20),
-                'economy': await self.get_hashtags_by_category('economy', limit=20),
+                'all': all_trending[:50],
+                'politics': self._filter_by_category(all_trending, 'politics', limit=20),
+                'entertainment': self._filter_by_category(all_trending, 'entertainment', limit=20),
+                'sports': self._filter_by_category(all_trending, 'sports', limit=20),
+                'economy': self._filter_by_category(all_trending, 'economy', limit=20),
                 'updated_at': datetime.utcnow().isoformat()
             }
 
@@ -378,10 +454,9 @@ class HashtagDiscoveryService:
             return {}
 
 
-# Singleton instance
-_hashtag_service = None
-
-
 def get_hashtag_discovery_service(db: AsyncSession) -> HashtagDiscoveryService:
-    """Get hashtag discovery service instance"""
-    return HashtagDiscoveryService(db)
\ No newline at end of file
+    """Get hashtag discovery service instance (one per session, kept in db.info)"""
+    service = db.info.get('hashtag_discovery_service')
+    if service is None:
+        service = db.info['hashtag_discovery_service'] = HashtagDiscoveryService(db)
+    return service
\ No newline at end of file
@@ -5,9 +5,10 @@ Tracks health and performance of all data sources
 
 import logging
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_
+from sqlalchemy import select, update, and_, or_, case, func
+from sqlalchemy.dialects.postgresql import insert
 
 from app.models.social_media_sources import DataSourceMonitoring
 
@@ -45,55 +46,52 @@ class MonitoringService:
             True if recorded successfully
         """
         try:
-            # Get or create monitoring record
-            result = await self.db.execute(
-                select(DataSourceMonitoring)
-                .where(and_(
-                    DataSourceMonitoring.source_type == source_type,
-                    DataSourceMonitoring.source_name == source_name
-                ))
-            )
-            monitor = result.scalar_one_or_none()
-
             now = datetime.utcnow()
 
-            if not monitor:
-                # Create new monitoring record
-                monitor = DataSourceMonitoring(
-                    source_type=source_type,
-                    source_name=source_name,
-                    status="active" if success else "failed",
-                    last_successful_fetch=now if success else None,
-                    last_attempt=now,
-                    total_items_collected=items_collected,
-                    items_collected_today=items_collected,
-                    consecutive_failures=0 if success else 1,
-                    last_error=error_message if not success else None,
-                    error_count=0 if success else 1,
-                    collection_frequency=3600,  # Default 1 hour
-                    priority=1
-                )
-                self.db.add(monitor)
+            # Update the existing record in place, computed from its current values
+            if success:
+                updates = {
+                    'status': "active",
+                    'last_successful_fetch': now,
+                    'total_items_collected': DataSourceMonitoring.total_items_collected + items_collected,
+                    'items_collected_today': DataSourceMonitoring.items_collected_today + items_collected,
+                    'consecutive_failures': 0
+                }
             else:
-                # Update existing record
-                if success:
-                    monitor.status = "active"
-                    monitor.last_successful_fetch = now
-                    monitor.total_items_collected += items_collected
-                    monitor.items_collected_today += items_collected
-                    monitor.consecutive_failures = 0
-                else:
-                    monitor.status = "failed"
-                    monitor.consecutive_failures += 1
-                    monitor.last_error = error_message
-                    monitor.error_count += 1
-
-                    # Update status based on consecutive failures
-                    if monitor.consecutive_failures >= 5:
-                        monitor.status = "degraded"
-
-                monitor.last_attempt = now
-                monitor.updated_at = now
+                updates = {
+                    # Degraded after 5 consecutive failures
+                    'status': case(
+                        (DataSourceMonitoring.consecutive_failures + 1 >= 5, "degraded"),
+                        else_="failed"
+                    ),
+                    'consecutive_failures': DataSourceMonitoring.consecutive_failures + 1,
+                    'last_error': error_message,
+                    'error_count': DataSourceMonitoring.error_count + 1
+                }
+            updates['last_attempt'] = now
+            updates['updated_at'] = now
+
+            # Create the monitoring record, or update it if it already exists,
+            # in a single statement
+            stmt = insert(DataSourceMonitoring).values(
+                source_type=source_type,
+                source_name=source_name,
+                status="active" if success else "failed",
+                last_successful_fetch=now if success else None,
+                last_attempt=now,
+                total_items_collected=items_collected,
+                items_collected_today=items_collected,
+                consecutive_failures=0 if success else 1,
+                last_error=error_message if not success else None,
+                error_count=0 if success else 1,
+                collection_frequency=3600,  # Default 1 hour
+                priority=1
+            ).on_conflict_do_update(
+                index_elements=['source_type', 'source_name'],
+                set_=updates
+            )
+
+            await self.db.execute(stmt)
 
             await self.db.commit()
             return True
@@ -155,13 +153,16 @@ class MonitoringService:
             Health summary
         """
         try:
+            # Count sources per status in the database
             result = await self.db.execute(
-                select(DataSourceMonitoring)
+                select(DataSourceMonitoring.status, func.count())
+                .group_by(DataSourceMonitoring.status)
             )
 
-            sources = result.scalars().all()
+            counts = dict(result.all())
+            total_sources = sum(counts.values())
 
-            if not sources:
+            if not total_sources:
                 return {
                     "overall_status": "unknown",
                     "total_sources": 0,
@@ -170,22 +171,22 @@ class MonitoringService:
                     "degraded_sources": 0
                 }
 
-            active = sum(1 for s in sources if s.status == "active")
-            failed = sum(1 for s in sources if s.status == "failed")
-            degraded = sum(1 for s in sources if s.status == "degraded")
-            rate_limited = sum(1 for s in sources if s.status == "rate_limited")
+            active = counts.get("active", 0)
+            failed = counts.get("failed", 0)
+            degraded = counts.get("degraded", 0)
+            rate_limited = counts.get("rate_limited", 0)
 
             # Determine overall status
             if failed + degraded == 0:
                 overall_status = "healthy"
-            elif failed + degraded <= len(sources) * 0.3:
+            elif failed + degraded <= total_sources * 0.3:
                 overall_status = "warning"
             else:
                 overall_status = "critical"
 
             return {
                 "overall_status": overall_status,
-                "total_sources": len(sources),
+                "total_sources": total_sources,
                 "active_sources": active,
                 "failed_sources": failed,
                 "degraded_sources": degraded,
@@ -268,36 +269,36 @@ class MonitoringService:
             List of sources due for collection
         """
         try:
-            now = datetime.utcnow()
+            # A source is due once collection_frequency seconds have passed since
+            # its last successful fetch, or if it has never been collected
+            next_collection = DataSourceMonitoring.last_successful_fetch + func.make_interval(
+                0, 0, 0, 0, 0, 0, DataSourceMonitoring.collection_frequency
+            )
 
             result = await self.db.execute(
-                select(DataSourceMonitoring)
+                select(
+                    DataSourceMonitoring.source_type,
+                    DataSourceMonitoring.source_name,
+                    DataSourceMonitoring.priority,
+                    DataSourceMonitoring.collection_frequency
+                )
                 .where(DataSourceMonitoring.status.in_(["active", "degraded"]))
+                .where(or_(
+                    DataSourceMonitoring.last_successful_fetch.is_(None),
+                    next_collection <= func.now()
+                ))
                 .order_by(DataSourceMonitoring.priority)
             )
 
-            due_sources = []
-            for monitor in result.scalars():
-                # Check if collection is due
-                if monitor.last_successful_fetch:
-                    next_collection = monitor.last_successful_fetch + timedelta(
-                        seconds=monitor.collection_frequency
-                    )
-                    if now >= next_collection:
-                        due_sources.append({
-                            "source_type": monitor.source_type,
-                            "source_name": monitor.source_name,
-                            "priority": monitor.priority,
-                            "collection_frequency": monitor.collection_frequency
-                        })
-                else:
-                    # Never collected, add to list
-                    due_sources.append({
-                        "source_type": monitor.source_type,
-                        "source_name": monitor.source_name,
-                        "priority": monitor.priority,
-                        "collection_frequency": monitor.collection_frequency
-                    })
+            due_sources = [
+                {
+                    "source_type": source_type,
+                    "source_name": source_name,
+                    "priority": priority,
+                    "collection_frequency": collection_frequency
+                }
+                for source_type, source_name, priority, collection_frequency in result.all()
+            ]
 
             return due_sources
 
@@ -307,5 +308,8 @@ class MonitoringService:
 
 
 def get_monitoring_service(db: AsyncSession) -> MonitoringService:
-    """Get monitoring service instance"""
-    return MonitoringService(db)
+    """Get monitoring service instance (one per session, kept in db.info)"""
+    service = db.info.get('monitoring_service')
+    if service is None:
+        service = db.info['monitoring_service'] = MonitoringService(db)
+    return service
@@ -7,11 +7,14 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import asyncio
+import heapq
+import time
 from TikTokApi import TikTokApi
 import json
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import settings
+from app.services.cache_service import get_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -38,36 +41,87 @@ class TikTokService:
 
         # Rate limiting
         self.request_delay = 2  # seconds between requests
-        self.last_request_time = None
+        self._next_request_at = 0.0  # time.monotonic() of the next free request slot
+
+        # Shared TikTokApi instances, one per event loop since each browser
+        # session is bound to the loop that opened it (see _ensure_api)
+        self._apis: Dict[asyncio.AbstractEventLoop, TikTokApi] = {}
+        self._api_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
 
         logger.info("TikTok Service initialized")
 
     async def _rate_limit(self):
         """Implement rate limiting between requests"""
-        if self.last_request_time:
-            elapsed = (datetime.utcnow() - self.last_request_time).total_seconds()
-            if elapsed < self.request_delay:
-                await asyncio.sleep(self.request_delay - elapsed)
-        self.last_request_time = datetime.utcnow()
-
-    async def _get_api_instance(self) -> TikTokApi:
+        # Reserve the next slot before sleeping so concurrent callers queue up
+        # request_delay apart. There is no await between reading and updating
+        # _next_request_at, so no lock is needed.
+        now = time.monotonic()
+        slot = max(now, self._next_request_at)
+        self._next_request_at = slot + self.request_delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _ensure_api(self) -> TikTokApi:
         """
-        Create and configure TikTok API instance
+        Get the shared TikTok API instance, opening it on first use
+
+        Each event loop gets its own instance, reused across calls until
+        aclose(). Instances left behind by loops that have since closed can no
+        longer be shut down and are dropped with a warning.
 
         Returns:
             Configured TikTokApi instance
         """
-        try:
-            # Create API instance with supported parameters only
-            api = TikTokApi(
-                logging_level=logging.WARNING
-            )
+        loop = asyncio.get_running_loop()
+        for other_loop in [other for other in self._api_locks if other.is_closed()]:
+            del self._api_locks[other_loop]
+            if self._apis.pop(other_loop, None) is not None:
+                logger.warning("Dropped a TikTok API instance whose event loop closed before aclose()")
+
+        lock = self._api_locks.get(loop)
+        if lock is None:
+            lock = self._api_locks[loop] = asyncio.Lock()
+
+        async with lock:
+            api = self._apis.get(loop)
+            if api is None:
+                try:
+                    # Create API instance with supported parameters only
+                    api = TikTokApi(
+                        logging_level=logging.WARNING
+                    )
+                    await api.__aenter__()
+                    self._apis[loop] = api
 
-            return api
+                except Exception as e:
+                    logger.error(f"Error creating TikTok API instance: {e}")
+                    raise
 
-        except Exception as e:
-            logger.error(f"Error creating TikTok API instance: {e}")
-            raise
+        return api
+
+    async def aclose(self):
+        """
+        Close the shared TikTok API instances and their browser sessions
+
+        Instances opened on another event loop that is still running are
+        closed on that loop.
+        """
+        loop = asyncio.get_running_loop()
+        apis, self._apis = self._apis, {}
+        self._api_locks = {}
+        for api_loop, api in apis.items():
+            try:
+                if api_loop is loop:
+                    await api.__aexit__(None, None, None)
+                elif api_loop.is_running():
+                    await asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(api.__aexit__(None, None, None), api_loop)
+                    )
+                else:
+                    logger.warning("Dropped a TikTok API instance whose event loop is no longer running")
+            except Exception as e:
+                logger.warning(f"Error closing TikTok API instance: {e}")
+        logger.info("TikTok Service closed")
 
     @retry(
         stop=stop_after_attempt(3),
@@ -95,20 +149,18 @@ class TikTokService:
             await self._rate_limit()
 
             videos = []
-            api = await self._get_api_instance()
+            api = await self._ensure_api()
 
-            # Create async context
-            async with api:
-                # Search by hashtag
-                hashtag_obj = api.hashtag(name=hashtag)
+            # Search by hashtag
+            hashtag_obj = api.hashtag(name=hashtag)
 
-                async for video in hashtag_obj.videos(count=count):
-                    try:
-                        video_data = await self._extract_video_data(video)
-                        videos.append(video_data)
-                    except Exception as e:
-                        logger.warning(f"Error extracting video data: {e}")
-                        continue
+            async for video in hashtag_obj.videos(count=count):
+                try:
+                    video_data = await self._extract_video_data(video)
+                    videos.append(video_data)
+                except Exception as e:
+                    logger.warning(f"Error extracting video data: {e}")
+                    continue
 
             logger.info(f"Retrieved {len(videos)} videos for #{hashtag}")
             return videos
@@ -176,6 +228,8 @@ class TikTokService:
         """
         Get trending hashtags (uses predefined Nigerian hashtags)
 
+        Results are cached in Redis for TIKTOK_CACHE_TTL_TRENDING seconds.
+
         Args:
             region: Region code (NG for Nigeria)
             count: Number of hashtags to analyze
@@ -183,35 +237,45 @@ class TikTokService:
         Returns:
             List of trending hashtag data
         """
+        cache_service = get_cache_service()
+        cache_key = f"tiktok:trending:{region}:{count}"
+
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             logger.info(f"Fetching trending hashtags for {region}")
 
             trending_data = []
+            api = await self._ensure_api()
 
             # Analyze popular Nigerian hashtags
             for hashtag in self.nigerian_hashtags[:count]:
                 try:
                     await self._rate_limit()
 
-                    api = await self._get_api_instance()
-                    async with api:
-                        hashtag_obj = api.hashtag(name=hashtag)
+                    hashtag_obj = api.hashtag(name=hashtag)
 
-                        # Get hashtag info (videos count would require iteration)
-                        # For now, we'll collect basic info
-                        trending_data.append({
-                            "hashtag": hashtag,
-                            "name": f"#{hashtag}",
-                            "region": region,
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "source": "tiktok"
-                        })
+                    # Get hashtag info (videos count would require iteration)
+                    # For now, we'll collect basic info
+                    trending_data.append({
+                        "hashtag": hashtag,
+                        "name": f"#{hashtag}",
+                        "region": region,
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "source": "tiktok"
+                    })
 
                 except Exception as e:
                     logger.warning(f"Error fetching hashtag {hashtag}: {e}")
                     continue
 
             logger.info(f"Retrieved {len(trending_data)} trending hashtags")
+            if trending_data:
+                await cache_service.set(
+                    cache_key, trending_data, ttl=settings.TIKTOK_CACHE_TTL_TRENDING
+                )
             return trending_data
 
         except Exception as e:
@@ -242,18 +306,17 @@ class TikTokService:
             await self._rate_limit()
 
             videos = []
-            api = await self._get_api_instance()
+            api = await self._ensure_api()
 
-            async with api:
-                user = api.user(username=username)
+            user = api.user(username=username)
 
-                async for video in user.videos(count=count):
-                    try:
-                        video_data = await self._extract_video_data(video)
-                        videos.append(video_data)
-                    except Exception as e:
-                        logger.warning(f"Error extracting video data: {e}")
-                        continue
+            async for video in user.videos(count=count):
+                try:
+                    video_data = await self._extract_video_data(video)
+                    videos.append(video_data)
+                except Exception as e:
+                    logger.warning(f"Error extracting video data: {e}")
+                    continue
 
             logger.info(f"Retrieved {len(videos)} videos for user {username}")
             return videos
@@ -262,6 +325,32 @@ class TikTokService:
             logger.error(f"Error fetching user videos: {e}")
             return []
 
+    async def _search_hashtags_concurrently(
+        self,
+        hashtags: List[str],
+        videos_per_hashtag: int
+    ) -> List[Any]:
+        """
+        Search hashtags a few at a time
+
+        Returns:
+            Videos (or the raised exception) per hashtag in hashtags order
+        """
+        # The semaphore caps parallel searches; _rate_limit spaces out their requests
+        sem = asyncio.BoundedSemaphore(settings.TIKTOK_MONITOR_CONCURRENCY or 4)
+
+        async def _search_one(hashtag: str):
+            async with sem:
+                return await self.search_hashtag(
+                    hashtag=hashtag,
+                    count=videos_per_hashtag
+                )
+
+        return await asyncio.gather(
+            *(_search_one(hashtag) for hashtag in hashtags),
+            return_exceptions=True
+        )
+
     async def monitor_nigerian_content(
         self,
         max_videos_per_hashtag: int = 20,
@@ -283,38 +372,32 @@ class TikTokService:
             # Use provided hashtags or default Nigerian hashtags
             hashtags_to_monitor = hashtags if hashtags is not None else self.nigerian_hashtags
 
+            results = await self._search_hashtags_concurrently(
+                hashtags_to_monitor, max_videos_per_hashtag
+            )
+
             all_videos = []
             hashtag_stats = []
 
-            for hashtag in hashtags_to_monitor:
-                try:
-                    # Fetch videos for each hashtag
-                    videos = await self.search_hashtag(
-                        hashtag=hashtag,
-                        count=max_videos_per_hashtag
-                    )
-
-                    all_videos.extend(videos)
-
-                    # Calculate hashtag stats
-                    if videos:
-                        total_views = sum(v.get("metrics", {}).get("views", 0) for v in videos)
-                        total_likes = sum(v.get("metrics", {}).get("likes", 0) for v in videos)
+            for hashtag, videos in zip(hashtags_to_monitor, results):
+                if isinstance(videos, BaseException):
+                    logger.error(f"Error monitoring hashtag {hashtag}: {videos}")
+                    continue
 
-                        hashtag_stats.append({
-                            "hashtag": hashtag,
-                            "video_count": len(videos),
-                            "total_views": total_views,
-                            "total_likes": total_likes,
-                            "avg_engagement": (total_likes / total_views * 100) if total_views > 0 else 0
-                        })
+                all_videos.extend(videos)
 
-                    # Rate limiting between hashtags
-                    await asyncio.sleep(3)
+                # Calculate hashtag stats
+                if videos:
+                    total_views = sum(v.get("metrics", {}).get("views", 0) for v in videos)
+                    total_likes = sum(v.get("metrics", {}).get("likes", 0) for v in videos)
 
-                except Exception as e:
-                    logger.error(f"Error monitoring hashtag {hashtag}: {e}")
-                    continue
+                    hashtag_stats.append({
+                        "hashtag": hashtag,
+                        "video_count": len(videos),
+                        "total_views": total_views,
+                        "total_likes": total_likes,
+                        "avg_engagement": (total_likes / total_views * 100) if total_views > 0 else 0
+                    })
 
             result = {
                 "videos": all_videos,
@@ -421,6 +504,8 @@ class TikTokService:
         """
         Get analytics for a specific hashtag over time
 
+        Results are cached in Redis for TIKTOK_CACHE_TTL_ANALYTICS seconds.
+
         Args:
             hashtag: Hashtag to analyze
             days: Number of days to analyze
@@ -428,6 +513,13 @@ class TikTokService:
         Returns:
             Hashtag analytics data
         """
+        cache_service = get_cache_service()
+        cache_key = f"tiktok:analytics:{hashtag}:{days}"
+
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             logger.info(f"Analyzing hashtag #{hashtag} for {days} days")
 
@@ -441,15 +533,27 @@ class TikTokService:
                     "error": "No videos found"
                 }
 
-            # Calculate analytics
-            total_views = sum(v.get("metrics", {}).get("views", 0) for v in videos)
-            total_likes = sum(v.get("metrics", {}).get("likes", 0) for v in videos)
-            total_comments = sum(v.get("metrics", {}).get("comments", 0) for v in videos)
-            total_shares = sum(v.get("metrics", {}).get("shares", 0) for v in videos)
+            # Calculate analytics in one pass over the videos
+            total_views = total_likes = total_comments = total_shares = 0
+            engagement_rate_sum = 0.0
+
+            for video in videos:
+                metrics = video.get("metrics", {})
+                views = metrics.get("views", 0)
+                likes = metrics.get("likes", 0)
+                comments = metrics.get("comments", 0)
+                shares = metrics.get("shares", 0)
+
+                total_views += views
+                total_likes += likes
+                total_comments += comments
+                total_shares += shares
 
-            avg_engagement = sum(
-                self.calculate_engagement_rate(v) for v in videos
-            ) / len(videos) if videos else 0
+                # Same as calculate_engagement_rate
+                if views:
+                    engagement_rate_sum += (likes + comments + shares) / views * 100
+
+            avg_engagement = engagement_rate_sum / len(videos)
 
             analytics = {
                 "hashtag": hashtag,
@@ -465,6 +569,9 @@ class TikTokService:
             }
 
             logger.info(f"Analytics completed for #{hashtag}")
+            await cache_service.set(
+                cache_key, analytics, ttl=settings.TIKTOK_CACHE_TTL_ANALYTICS
+            )
             return analytics
 
         except Exception as e:
@@ -497,8 +604,9 @@ class TikTokService:
                 if not username:
                     continue
 
-                if username not in creator_stats:
-                    creator_stats[username] = {
+                stats = creator_stats.get(username)
+                if stats is None:
+                    stats = creator_stats[username] = {
                         "username": username,
                         "nickname": author.get("nickname"),
                         "video_count": 0,
@@ -507,16 +615,16 @@ class TikTokService:
                     }
 
                 metrics = video.get("metrics", {})
-                creator_stats[username]["video_count"] += 1
-                creator_stats[username]["total_views"] += metrics.get("views", 0)
-                creator_stats[username]["total_likes"] += metrics.get("likes", 0)
+                stats["video_count"] += 1
+                stats["total_views"] += metrics.get("views", 0)
+                stats["total_likes"] += metrics.get("likes", 0)
 
-            # Sort by total views
-            top_creators = sorted(
+            # Top creators by total views
+            top_creators = heapq.nlargest(
+                top_n,
                 creator_stats.values(),
-                key=lambda x: x["total_views"],
-                reverse=True
-            )[:top_n]
+                key=lambda x: x["total_views"]
+            )
 
             return top_creators
 
@@ -535,3 +643,11 @@ def get_tiktok_service() -> TikTokService:
     if _tiktok_service is None:
         _tiktok_service = TikTokService()
     return _tiktok_service
+
+
+async def close_tiktok_service():
+    """Close the TikTok service instance if one was created"""
+    global _tiktok_service
+    if _tiktok_service is not None:
+        await _tiktok_service.aclose()
+        _tiktok_service = None
@@ -3,11 +3,25 @@ from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 from app.models import Report
+from app.redis_client import report_progress_key
 import logging
+import redis
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# In-flight progress lives in Redis; only the final state is committed
+PROGRESS_TTL = 3600
+
+
+def _publish_progress(redis_client, report_id: str, progress: int):
+    """Record report progress in Redis (best effort)"""
+    try:
+        redis_client.set(report_progress_key(report_id), progress, ex=PROGRESS_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish progress for report {report_id}: {str(e)}")
+    logger.info(f"Report {report_id} progress: {progress}%")
+
 
 @celery_app.task(name="app.tasks.report_generation.generate_report_task")
 def generate_report_task(report_id: str, request_data: dict):
@@ -19,6 +33,7 @@ def generate_report_task(report_id: str, request_data: dict):
     engine = create_engine(sync_db_url)
     Session = sessionmaker(bind=engine)
     db = Session()
+    redis_client = redis.Redis.from_url(settings.REDIS_URL)
 
     try:
         # Get report record
@@ -28,8 +43,7 @@ def generate_report_task(report_id: str, request_data: dict):
             return {"status": "error", "error": "Report not found"}
 
         # Update progress
-        report.progress = 10
-        db.commit()
+        _publish_progress(redis_client, report_id, 10)
 
         # TODO: Implement actual report generation
         # 1. Fetch data based on request parameters
@@ -40,11 +54,9 @@ def generate_report_task(report_id: str, request_data: dict):
 
         # Simulate progress updates
         for progress in [25, 50, 75, 90]:
-            report.progress = progress
-            db.commit()
-            logger.info(f"Report {report_id} progress: {progress}%")
+            _publish_progress(redis_client, report_id, progress)
 
-        # Mark as completed
+        # Mark as completed (the only commit on success)
         report.status = "completed"
         report.progress = 100
         report.completed_at = datetime.utcnow()
@@ -67,6 +79,7 @@ def generate_report_task(report_id: str, request_data: dict):
         return {"status": "error", "error": str(e)}
     finally:
         db.close()
+        redis_client.close()
 from app.celery_app import celery_app
 from datetime import datetime, timedelta
 import logging
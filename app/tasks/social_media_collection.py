@@ -81,9 +81,13 @@ async def _collect_tiktok_content():
             storage_service = get_storage_service(db)
 
             # Monitor Nigerian content
-            result = await tiktok_service.monitor_nigerian_content(
-                max_videos_per_hashtag=20
-            )
+            try:
+                result = await tiktok_service.monitor_nigerian_content(
+                    max_videos_per_hashtag=20
+                )
+            finally:
+                # The browser session belongs to this task's event loop
+                await tiktok_service.aclose()
 
             if result.get('videos'):
                 # Store data in PostgreSQL
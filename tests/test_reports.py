@@ -0,0 +1,93 @@
+"""
+Tests for Report Generation Progress
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+pytest.importorskip("celery")
+pytest.importorskip("jose")
+
+import redis
+from redis.exceptions import RedisError
+
+from app.api.reports import _get_live_progress
+from app.tasks import report_generation
+from app.tasks.report_generation import PROGRESS_TTL, _publish_progress, generate_report_task
+
+
+class TestReportGenerationTask:
+    """Tests for the report generation worker"""
+
+    def test_publish_progress_sets_expiring_key(self):
+        """Test progress is written to Redis with a TTL"""
+        redis_client = MagicMock()
+
+        _publish_progress(redis_client, "r1", 50)
+
+        redis_client.set.assert_called_once_with("report:r1:progress", 50, ex=PROGRESS_TTL)
+
+    def test_publish_progress_swallows_redis_errors(self):
+        """Test a Redis outage doesn't fail the report"""
+        redis_client = MagicMock()
+        redis_client.set.side_effect = redis.ConnectionError("down")
+
+        _publish_progress(redis_client, "r1", 50)
+
+        redis_client.set.assert_called_once()
+
+    def test_generate_report_commits_once(self):
+        """Test in-flight progress goes to Redis and only the final state is committed"""
+        report = MagicMock(status="pending", progress=0)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = report
+        redis_client = MagicMock()
+
+        with patch.object(report_generation, 'create_engine'), \
+                patch.object(report_generation, 'sessionmaker', return_value=MagicMock(return_value=db)), \
+                patch.object(report_generation.redis.Redis, 'from_url', return_value=redis_client):
+            result = generate_report_task("r1", {})
+
+        assert result == {"status": "success", "report_id": "r1"}
+        assert [call.args[1] for call in redis_client.set.call_args_list] == [10, 25, 50, 75, 90]
+        db.commit.assert_called_once()
+        assert report.status == "completed"
+        assert report.progress == 100
+        db.close.assert_called_once()
+        redis_client.close.assert_called_once()
+
+
+class TestLiveProgress:
+    """Tests for reading report progress in the API"""
+
+    @pytest.mark.asyncio
+    async def test_prefers_redis_progress_while_generating(self):
+        """Test the worker's in-flight value wins over the stored progress"""
+        report = MagicMock(id="r1", status="pending", progress=0)
+        redis_client = MagicMock(get=AsyncMock(return_value="75"))
+
+        with patch('app.api.reports.get_redis', new=AsyncMock(return_value=redis_client)):
+            assert await _get_live_progress(report) == 75
+
+        redis_client.get.assert_awaited_once_with("report:r1:progress")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_database_progress(self):
+        """Test the stored progress is used when Redis has no value or is down"""
+        report = MagicMock(id="r1", status="pending", progress=10)
+
+        with patch('app.api.reports.get_redis', new=AsyncMock(return_value=MagicMock(get=AsyncMock(return_value=None)))):
+            assert await _get_live_progress(report) == 10
+
+        with patch('app.api.reports.get_redis', new=AsyncMock(side_effect=RedisError("down"))):
+            assert await _get_live_progress(report) == 10
+
+    @pytest.mark.asyncio
+    async def test_finished_reports_use_database_progress(self):
+        """Test completed and failed reports skip Redis"""
+        with patch('app.api.reports.get_redis', new=AsyncMock()) as mock_get_redis:
+            for status in ("completed", "failed"):
+                report = MagicMock(id="r1", status=status, progress=100)
+                assert await _get_live_progress(report) == 100
+
+        mock_get_redis.assert_not_awaited()
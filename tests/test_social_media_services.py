@@ -2,16 +2,116 @@
 Tests for Social Media Services
 """
 
+import asyncio
+import contextlib
+import threading
+import time
+import uuid
+import impit
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.services.google_trends_service import GoogleTrendsService
+from pytrends.exceptions import TooManyRequestsError
+
+from app.services.google_trends_service import (
+    FILL_WAIT_INTERVAL, GoogleTrendsService, RateLimitCooldown, _SessionTrendReq
+)
 from app.services.tiktok_service import TikTokService
 from app.services.facebook_service import FacebookService
 from app.services.apify_service import ApifyService
 
 
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+# Google Trends API responses, trimmed to the fields the parsers read
+INTEREST_OVER_TIME_JSON = {
+    "default": {
+        "timelineData": [
+            {"time": "1700006400", "formattedTime": "Nov 15, 2023", "value": [80, 40], "hasData": [True, True]},
+            {"time": "1700092800", "formattedTime": "Nov 16, 2023", "value": [35, 12],
+             "hasData": [True, True], "isPartial": True},
+            {"time": "1699920000", "formattedTime": "Nov 14, 2023", "value": [100, 0], "hasData": [True, False]}
+        ],
+        "averages": []
+    }
+}
+
+INTEREST_BY_REGION_JSON = {
+    "default": {
+        "geoMapData": [
+            {"geoCode": "NG-LA", "geoName": "Lagos", "value": [100], "hasData": [True]},
+            {"geoCode": "NG-FC", "geoName": "Federal Capital Territory", "value": [64], "hasData": [True]},
+            {"geoCode": "NG-BO", "geoName": "Borno", "value": [0], "hasData": [False]}
+        ]
+    }
+}
+
+RELATED_QUERIES_JSON = {
+    "default": {
+        "rankedList": [
+            {"rankedKeyword": [
+                {"query": "naira to dollar", "value": 100, "formattedValue": "100"},
+                {"query": "naira rate", "value": 48, "formattedValue": "48"}
+            ]},
+            {"rankedKeyword": [
+                {"query": "naira redesign", "value": 3550, "formattedValue": "+3,550%"},
+                {"query": "new naira notes", "formattedValue": "Breakout"}
+            ]}
+        ]
+    }
+}
+
+
+def _related_queries_widget(keyword: str) -> dict:
+    """A RELATED_QUERIES widget as returned by build_payload"""
+    return {
+        "id": "RELATED_QUERIES",
+        "request": {"restriction": {"complexKeywordsRestriction": {"keyword": [{"type": "BROAD", "value": keyword}]}}},
+        "token": "t"
+    }
+
+
+@contextlib.asynccontextmanager
+async def _postgres_session():
+    """A session on the configured PostgreSQL database whose changes are rolled back"""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from app.config import settings
+    from app.models.social_media_sources import ApifyScrapedData
+
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        pytest.skip("PostgreSQL database not configured")
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        try:
+            conn = await engine.connect()
+        except Exception as e:
+            pytest.skip(f"PostgreSQL database not reachable: {e}")
+        transaction = await conn.begin()
+        try:
+            await conn.run_sync(lambda sync_conn: ApifyScrapedData.__table__.create(sync_conn, checkfirst=True))
+            async with AsyncSession(bind=conn) as session:
+                yield session
+        finally:
+            await transaction.rollback()
+            await conn.close()
+    finally:
+        await engine.dispose()
+
+
+def _trends_client(**attributes) -> _SessionTrendReq:
+    """A pytrends client with a built payload and no Google cookie request"""
+    client = _SessionTrendReq.__new__(_SessionTrendReq)
+    client.tz = 60
+    client.geo = "NG"
+    client.kw_list = ["naira", "dollar"]
+    client.__dict__.update(attributes)
+    return client
+
+
 class TestGoogleTrendsService:
     """Tests for Google Trends Service"""
 
@@ -50,6 +150,199 @@ class TestGoogleTrendsService:
             assert result is not None
             assert isinstance(result, list)
 
+    @pytest.mark.asyncio
+    async def test_related_queries_shares_concurrent_calls(self):
+        """Test identical concurrent lookups share one fetch and are then cached"""
+        service = GoogleTrendsService()
+
+        async def fake_fetch(pytrends, keyword, geo):
+            await asyncio.sleep(0.01)
+            return {"keyword": keyword, "top_queries": [], "rising_queries": []}
+
+        with patch.object(service, '_get_redis', new=AsyncMock(return_value=None)), \
+                patch.object(service, '_call', new=AsyncMock(return_value=MagicMock())), \
+                patch.object(service, '_fetch_related_queries',
+                             new=AsyncMock(side_effect=fake_fetch)) as mock_fetch:
+            results = await asyncio.gather(
+                service.get_related_queries("naira"),
+                service.get_related_queries("naira")
+            )
+            cached = await service.get_related_queries("naira")
+
+            assert mock_fetch.await_count == 1
+            assert results[0] == results[1] == cached
+            assert results[0]["keyword"] == "naira"
+
+    def test_interest_over_time_records_parses_timeline(self):
+        """Test interest over time is parsed in time order, keeping the partial last point"""
+        client = _trends_client(interest_over_time_widget={"request": {}, "token": "t"})
+
+        with patch.object(client, '_get_data', return_value=INTEREST_OVER_TIME_JSON):
+            records = client.interest_over_time_records()
+
+        assert records == [
+            {"date": "2023-11-14T00:00:00", "values": {"naira": 100, "dollar": 0}},
+            {"date": "2023-11-15T00:00:00", "values": {"naira": 80, "dollar": 40}},
+            {"date": "2023-11-16T00:00:00", "values": {"naira": 35, "dollar": 12}}
+        ]
+
+    def test_interest_over_time_records_empty_timeline(self):
+        """Test a keyword without enough search volume yields no points"""
+        client = _trends_client(interest_over_time_widget={"request": {}, "token": "t"})
+
+        with patch.object(client, '_get_data', return_value={"default": {"timelineData": [], "averages": []}}):
+            assert client.interest_over_time_records() == []
+
+    def test_interest_by_region_records_parses_regions(self):
+        """Test regional interest is parsed into name-sorted pairs, including regions without data"""
+        client = _trends_client(interest_by_region_widget={"request": {}, "token": "t"})
+
+        with patch.object(client, '_get_data', return_value=INTEREST_BY_REGION_JSON) as mock_get:
+            records = client.interest_by_region_records(resolution="REGION", inc_low_vol=True)
+
+        assert records == [("Borno", 0), ("Federal Capital Territory", 64), ("Lagos", 100)]
+        # Google ignores a resolution for a single-country query, so none is sent
+        assert client.interest_by_region_widget["request"] == {"includeLowSearchVolumeGeos": True}
+        assert mock_get.call_args.kwargs["params"]["token"] == "t"
+
+    def test_interest_by_region_records_empty(self):
+        """Test a response without regional data yields no regions"""
+        client = _trends_client(interest_by_region_widget={"request": {}, "token": "t"})
+
+        with patch.object(client, '_get_data', return_value={"default": {"geoMapData": []}}):
+            assert client.interest_by_region_records() == []
+
+    def test_related_queries_records_parses_ranked_lists(self):
+        """Test top and rising queries are parsed, with "Breakout" for rising queries without a value"""
+        client = _trends_client(related_queries_widget_list=[_related_queries_widget("naira")])
+
+        with patch.object(client, '_get_data', return_value=RELATED_QUERIES_JSON):
+            records = client.related_queries_records()
+
+        assert records == {
+            "naira": {
+                "top": [{"query": "naira to dollar", "value": 100}, {"query": "naira rate", "value": 48}],
+                "rising": [{"query": "naira redesign", "value": 3550}, {"query": "new naira notes", "value": "Breakout"}]
+            }
+        }
+
+    def test_related_queries_records_missing_ranked_lists(self):
+        """Test responses without one or both ranked lists yield empty query lists"""
+        client = _trends_client(related_queries_widget_list=[
+            _related_queries_widget("naira"),
+            _related_queries_widget("dollar")
+        ])
+        responses = [
+            {"default": {}},
+            {"default": {"rankedList": [{"rankedKeyword": [{"query": "dollar rate", "value": 100}]}]}}
+        ]
+
+        with patch.object(client, '_get_data', side_effect=responses):
+            records = client.related_queries_records()
+
+        assert records == {
+            "naira": {"top": [], "rising": []},
+            "dollar": {"top": [{"query": "dollar rate", "value": 100}], "rising": []}
+        }
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_copies_and_empty_series_are_not_fresh(self):
+        """Test callers can't mutate cached entries and empty interest data is only negative-cached"""
+        service = GoogleTrendsService()
+        related = {"keyword": "naira", "top_queries": [{"query": "naira rate", "value": 100}], "rising_queries": []}
+        empty = {"keywords": ["naira"], "data": [], "timeframe": "today 3-m"}
+
+        with patch.object(service, '_get_redis', new=AsyncMock(return_value=None)), \
+                patch.object(service, '_with_client', new=AsyncMock(side_effect=[related, empty])):
+            first = await service.get_related_queries("naira")
+            first["top_queries"].clear()
+            second = await service.get_related_queries("naira")
+            assert second["top_queries"] == [{"query": "naira rate", "value": 100}]
+
+            result = await service.get_interest_over_time(["naira"])
+            assert result["data"] == []
+            assert service._caches["interest_over_time"].get((("naira",), "today 3-m", "NG")) is None
+            assert service._negative_cache.get(
+                ("interest_over_time", (("naira",), "today 3-m", "NG"))
+            ) == empty
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_fill_lock_is_released_only_with_its_token(self):
+        """Test the Redis fill lock is tokened, sized to the fetch timeout and released by compare-and-delete"""
+        service = GoogleTrendsService()
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.set = AsyncMock(return_value=True)
+        redis.eval = AsyncMock(return_value=1)
+
+        with patch.object(service, '_get_redis', new=AsyncMock(return_value=redis)), \
+                patch.object(service, '_with_client',
+                             new=AsyncMock(return_value={"keyword": "naira", "top_queries": [], "rising_queries": []})):
+            await service.get_related_queries("naira")
+
+        lock_key, token = redis.set.await_args_list[0].args
+        assert lock_key.startswith("gt:lock:gt:related_queries:")
+        assert redis.set.await_args_list[0].kwargs == {
+            "nx": True,
+            "px": service.timeout * service.max_retries * 1000
+        }
+        script, numkeys, unlock_key, unlock_token = redis.eval.await_args.args
+        assert "redis.call('get', KEYS[1]) == ARGV[1]" in script
+        assert (numkeys, unlock_key, unlock_token) == (1, lock_key, token)
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_fill_lock_waiter_gives_up_after_short_wait(self):
+        """Test a worker that loses the fill race polls only briefly, then fetches itself"""
+        from app.config import settings
+
+        service = GoogleTrendsService()
+        redis = MagicMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.set = AsyncMock(return_value=False)
+        redis.exists = AsyncMock(return_value=True)
+        fetched = {"keyword": "naira", "top_queries": [], "rising_queries": []}
+
+        with patch.object(service, '_get_redis', new=AsyncMock(return_value=redis)), \
+                patch('app.services.google_trends_service.asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+                patch.object(service, '_with_client', new=AsyncMock(return_value=fetched)) as mock_fetch:
+            result = await service.get_related_queries("naira")
+
+        assert result == fetched
+        mock_fetch.assert_awaited_once()
+        assert mock_sleep.await_count == settings.GT_MAX_COOLDOWN_WAIT / FILL_WAIT_INTERVAL
+        assert mock_sleep.await_count < service.fill_lock_ms / 1000 / FILL_WAIT_INTERVAL
+        service.close()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_cooldown_escalates_and_rejects_callers(self):
+        """Test a 429 doubles the cooldown and long cooldowns turn callers away"""
+        service = GoogleTrendsService()
+        response = MagicMock(status_code=429, headers={})
+        func = MagicMock(side_effect=TooManyRequestsError("rate limited", response))
+
+        try:
+            with pytest.raises(RateLimitCooldown):
+                await service._call(func)
+            assert func.call_count == 1
+            assert service._throttle_level == 1
+
+            # A caller arriving during the cooldown is rejected without a request
+            with pytest.raises(RateLimitCooldown):
+                await service._call(func)
+            assert func.call_count == 1
+
+            # The next 429 after the cooldown pauses for twice as long
+            service._backoff_until = 0.0
+            with pytest.raises(RateLimitCooldown):
+                await service._call(func)
+            remaining = service._backoff_until - time.monotonic()
+            assert service._throttle_level == 2
+            assert 0.5 * 120 - 1 < remaining <= 120
+        finally:
+            service.close()
+
 
 class TestTikTokService:
     """Tests for TikTok Service"""
@@ -74,6 +367,76 @@ class TestTikTokService:
             assert result is not None
             assert len(result) > 0
 
+    @pytest.mark.asyncio
+    async def test_monitor_nigerian_content_searches_concurrently(self):
+        """Test monitoring searches hashtags in parallel and keeps their order"""
+        service = TikTokService()
+
+        async def fake_search(hashtag, count):
+            await asyncio.sleep(0.01 if hashtag == "lagos" else 0)
+            if hashtag == "abuja":
+                raise RuntimeError("blocked")
+            return [{"video_id": hashtag, "metrics": {"views": 100, "likes": 10}}]
+
+        with patch.object(service, 'search_hashtag', new=AsyncMock(side_effect=fake_search)):
+            result = await service.monitor_nigerian_content(
+                max_videos_per_hashtag=5,
+                hashtags=["lagos", "abuja", "naija"]
+            )
+
+            assert [v["video_id"] for v in result["videos"]] == ["lagos", "naija"]
+            assert [s["hashtag"] for s in result["hashtag_stats"]] == ["lagos", "naija"]
+            assert result["hashtag_stats"][0]["avg_engagement"] == 10
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_spaces_concurrent_requests(self):
+        """Test concurrent callers get request slots request_delay apart"""
+        service = TikTokService()
+        clock = MagicMock(return_value=100.0)
+
+        with patch('app.services.tiktok_service.time.monotonic', clock), \
+                patch('app.services.tiktok_service.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            await asyncio.gather(*(service._rate_limit() for _ in range(3)))
+
+            assert [call.args[0] for call in mock_sleep.await_args_list] == [2, 4]
+            assert service._next_request_at == 106.0
+
+            # Once the reserved slots have passed, the next request goes straight out
+            clock.return_value = 110.0
+            mock_sleep.reset_mock()
+            await service._rate_limit()
+
+            mock_sleep.assert_not_awaited()
+            assert service._next_request_at == 112.0
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_api_instances_from_every_loop(self):
+        """Test each event loop gets its own TikTok API instance and aclose closes them all"""
+        service = TikTokService()
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+
+        try:
+            with patch('app.services.tiktok_service.TikTokApi', side_effect=lambda **kwargs: MagicMock()):
+                other_api = await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(service._ensure_api(), other_loop)
+                )
+                api = await service._ensure_api()
+
+                assert await service._ensure_api() is api
+                assert api is not other_api
+
+                await service.aclose()
+
+            api.__aexit__.assert_awaited_once()
+            other_api.__aexit__.assert_awaited_once()
+            assert service._apis == {}
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+
     def test_calculate_engagement_rate(self):
         """Test engagement rate calculation"""
         service = TikTokService()
@@ -132,6 +495,129 @@ class TestFacebookService:
 
         assert engagement_score > 0
 
+    @pytest.mark.asyncio
+    async def test_search_posts_by_keywords(self):
+        """Test multi-keyword search over a single scrape"""
+        service = FacebookService()
+
+        with patch.object(service, 'scrape_page_posts', new=AsyncMock()) as mock_scrape:
+            mock_scrape.return_value = [
+                {"source_id": "1", "content": "Fuel price rises in LAGOS"},
+                {"source_id": "2", "content": {"text": "Abuja traffic update"}},
+                {"source_id": "3", "content": "Super Eagles win"}
+            ]
+
+            result = await service.search_posts_by_keywords(
+                "testpage", ["lagos", "Abuja", "naira"]
+            )
+
+            assert mock_scrape.await_count == 1
+            assert [p["source_id"] for p in result["lagos"]] == ["1"]
+            assert [p["source_id"] for p in result["Abuja"]] == ["2"]
+            assert result["naira"] == []
+
+
+    @pytest.mark.asyncio
+    async def test_scrape_page_posts_shares_concurrent_calls(self):
+        """Test concurrent scrapes of one page share a single Apify run"""
+        service = FacebookService()
+
+        async def fake_scrape(**kwargs):
+            await asyncio.sleep(0.01)
+            return {"posts": [{"content": "post"}]}
+
+        with patch.object(service.apify_service, 'scrape_facebook_page',
+                          new=AsyncMock(side_effect=fake_scrape)) as mock_scrape:
+            results = await asyncio.gather(
+                service.scrape_page_posts("https://www.facebook.com/test"),
+                service.scrape_page_posts("https://www.facebook.com/test")
+            )
+            cached = await service.scrape_page_posts("https://www.facebook.com/test")
+
+            assert mock_scrape.await_count == 1
+            assert results[0] == results[1] == cached == [{"content": "post"}]
+
+    @pytest.mark.asyncio
+    async def test_get_page_analytics_scrapes_page_url(self):
+        """Test page analytics scrapes the page by URL and aggregates Apify posts"""
+        service = FacebookService()
+
+        with patch.object(service.apify_service, 'scrape_facebook_page', new=AsyncMock()) as mock_scrape:
+            mock_scrape.return_value = {
+                "posts": [
+                    {"source_id": "p1", "content": "First", "has_image": True,
+                     "metrics": {"likes": 10, "comments": 2, "shares": 1}},
+                    {"source_id": "p2", "content": "Second", "has_video": True, "has_image": True,
+                     "metrics": {"likes": 5, "comments": 0, "shares": 0}},
+                    {"source_id": "p3", "content": "Third",
+                     "metrics": {"likes": 30, "comments": 4, "shares": 2}}
+                ]
+            }
+
+            analytics = await service.get_page_analytics("punchng", pages=1)
+
+            mock_scrape.assert_awaited_once()
+            assert mock_scrape.await_args.kwargs["page_url"] == "https://www.facebook.com/punchng"
+            assert mock_scrape.await_args.kwargs["posts_limit"] == 50
+            assert analytics["total_posts"] == 3
+            assert analytics["engagement_summary"]["total_engagement"] == 54
+            # A video post with a thumbnail image counts as video only
+            assert analytics["post_type_distribution"] == {"with_images": 1, "with_videos": 1, "text_only": 1}
+            assert [(p["post_id"], p["engagement"]) for p in analytics["top_posts"]] == [
+                ("p3", 36), ("p1", 13), ("p2", 5)
+            ]
+
+    @pytest.mark.asyncio
+    async def test_scrape_page_posts_retries_transient_errors(self):
+        """Test a transient Apify failure is retried and a persistent one gives no posts"""
+        service = FacebookService()
+        apify = ApifyService()
+        apify.client = MagicMock()
+        apify.async_client = MagicMock()
+        service.apify_service = apify
+
+        dataset = MagicMock()
+        dataset.iterate_items = lambda: _aiter([{"postText": "hello", "likes": 3}])
+        apify.async_client.dataset.return_value = dataset
+
+        call = AsyncMock(side_effect=[
+            impit.ConnectError("reset"),
+            impit.ConnectError("reset"),
+            {"status": "SUCCEEDED", "id": "run1", "defaultDatasetId": "ds1"}
+        ])
+        apify.async_client.actor.return_value.call = call
+
+        with patch.object(ApifyService.run_actor.retry, 'sleep', new=AsyncMock()) as mock_sleep:
+            posts = await service.scrape_page_posts("retrypage")
+
+            assert call.await_count == 3
+            assert mock_sleep.await_count == 2
+            assert [p["content"] for p in posts] == ["hello"]
+
+            call.reset_mock(side_effect=True)
+            call.side_effect = impit.ConnectError("down")
+            posts = await service.scrape_page_posts("downpage")
+
+            assert call.await_count == 3
+            assert posts == []
+
+    @pytest.mark.asyncio
+    async def test_monitor_nigerian_pages_tolerates_posts_without_metrics(self):
+        """Test a post with no metrics counts as zero engagement instead of failing the run"""
+        service = FacebookService()
+
+        with patch.object(service, '_scrape_pages_bulk', new=AsyncMock()) as mock_bulk:
+            mock_bulk.return_value = [[
+                {"content": "with", "metrics": {"likes": 4, "comments": 2, "shares": 0}},
+                {"content": "without"}
+            ]]
+
+            result = await service.monitor_nigerian_pages(page_list=["https://www.facebook.com/a"])
+
+            assert len(result["posts"]) == 2
+            assert result["page_stats"][0]["total_engagement"] == 6
+            assert result["page_stats"][0]["avg_engagement"] == 3
+
 
 class TestApifyService:
     """Tests for Apify Service"""
@@ -168,6 +654,29 @@ class TestApifyService:
             assert result is not None
             assert "status" in result
 
+    @pytest.mark.asyncio
+    async def test_scrape_facebook_pages_bulk(self):
+        """Test bulk Facebook scrape groups posts by start URL"""
+        service = ApifyService()
+        pages = ["https://www.facebook.com/pageA", "https://www.facebook.com/pageB"]
+
+        with patch.object(service, 'run_actor', new=AsyncMock()) as mock_run:
+            mock_run.return_value = {
+                "status": "SUCCEEDED",
+                "data": [
+                    {"postText": "a1", "inputUrl": "https://www.facebook.com/pageA/"},
+                    {"postText": "b1", "inputUrl": "https://www.facebook.com/pageB"},
+                    {"postText": "a2", "facebookUrl": "https://www.facebook.com/pagea"}
+                ]
+            }
+
+            result = await service.scrape_facebook_pages_bulk(pages, posts_limit=10)
+
+            mock_run.assert_awaited_once()
+            by_page = result["posts_by_page"]
+            assert [p["content"] for p in by_page[pages[0]]] == ["a1", "a2"]
+            assert [p["content"] for p in by_page[pages[1]]] == ["b1"]
+
 
 class TestDataPipeline:
     """Tests for Data Pipeline Service"""
@@ -213,6 +722,181 @@ class TestDataPipeline:
         assert "Naija" in hashtags
 
 
+class TestGeocodingService:
+    """Tests for Geocoding Service"""
+
+    def test_geocode_matches_whole_names_case_insensitively(self):
+        """Test states match as whole words in any case, and other names don't"""
+        from app.services.geocoding_service import GeocodingService
+
+        assert GeocodingService.geocode_location("Lagos, Nigeria") == {"lat": 6.5244, "lon": 3.3792}
+        assert GeocodingService.geocode_location("  PORT HARCOURT ") == {"lat": 4.8156, "lon": 7.0498}
+        assert GeocodingService.get_region_for_location("port harcourt") == "South South"
+
+        # "Aba" and "Jos" are substrings here, not the cities
+        assert GeocodingService.geocode_location("Abakaliki") is None
+        assert GeocodingService.get_region_for_location("Jose") is None
+        assert GeocodingService.geocode_location("Abakaliki, Nigeria") == {"lat": 9.0820, "lon": 8.6753}
+
+    def test_geocode_prefers_first_state_then_region(self):
+        """Test the first state mentioned wins and regions are matched directly"""
+        from app.services.geocoding_service import GeocodingService
+
+        assert GeocodingService.get_region_for_location("Moved from Kano to Lagos") == "North West"
+        assert GeocodingService.geocode_location("Moved from Kano to Lagos") == {"lat": 12.0022, "lon": 8.5920}
+
+        enriched = GeocodingService.enrich_location_data("north east")
+        assert enriched["coordinates"] == {"lat": 10.5, "lon": 11.5}
+        assert enriched["region"] == "North East"
+        assert enriched["country"] == "Nigeria"
+
+        assert GeocodingService.geocode_location("London") is None
+        assert GeocodingService.enrich_location_data("London")["country"] is None
+
+    def test_geocode_results_are_not_shared(self):
+        """Test mutating a returned result doesn't change later lookups"""
+        from app.services.geocoding_service import GeocodingService
+
+        GeocodingService.geocode_location("Abuja")["lat"] = 0
+        GeocodingService.geocode_location("South East")["lon"] = 0
+
+        assert GeocodingService.geocode_location("abuja") == {"lat": 9.0765, "lon": 7.3986}
+        assert GeocodingService.geocode_location("south east") == {"lat": 6.0, "lon": 7.5}
+        assert GeocodingService.NIGERIAN_REGIONS["South East"] == {"lat": 6.0, "lon": 7.5}
+
+
+class TestHashtagDiscoveryService:
+    """Tests for Hashtag Discovery Service"""
+
+    @pytest.mark.asyncio
+    async def test_update_trending_cache_scores_once(self):
+        """Test the cache refresh scores hashtags once and slices categories from it"""
+        from app.services.hashtag_discovery_service import HashtagDiscoveryService
+
+        service = HashtagDiscoveryService(MagicMock())
+        cache_service = MagicMock(get=AsyncMock(return_value=None), set=AsyncMock(return_value=True))
+
+        with patch('app.services.hashtag_discovery_service.get_cache_service', return_value=cache_service), \
+                patch.object(service, '_score_hashtags', new=AsyncMock()) as mock_score:
+            mock_score.return_value = ['nigeria', 'tinubu', 'afcon2025', 'nairarate', 'nollywood']
+
+            cache = await service.update_trending_cache()
+
+            mock_score.assert_awaited_once()
+            cache_service.get.assert_not_awaited()
+            assert cache['all'] == mock_score.return_value
+            assert cache['politics'] == ['tinubu']
+            assert cache['sports'] == ['afcon2025']
+            assert cache['economy'] == ['nairarate']
+            assert cache['entertainment'] == ['nollywood']
+
+    @pytest.mark.asyncio
+    async def test_trending_from_collected_content_matches_python_aggregation(self):
+        """Test the SQL hashtag aggregate gives the counts, engagement and order of the Python loop it replaced"""
+        from app.models.social_media_sources import ApifyScrapedData
+        from app.services.hashtag_discovery_service import HashtagDiscoveryService
+
+        prefix = f"t{uuid.uuid4().hex[:8]}"
+        now = datetime.now(timezone.utc)
+        rows = [
+            ([f"{prefix}Naira", f"{prefix}tinubu"], {"likes": 120, "comments": 30, "views": 1550}, now),
+            ([f"{prefix}naira"], {"likes": 5, "shares": 2, "retweets": 7}, now - timedelta(hours=1)),
+            ([f"{prefix}naira", f"{prefix}afcon"], None, now - timedelta(hours=2)),
+            ([f"{prefix}tinubu"], {"likes": 4000, "views": 99}, now - timedelta(hours=3)),
+            ([f"{prefix}afcon"], {"comments": 1}, now - timedelta(hours=4)),
+            ([f"{prefix}afcon"], {"likes": 10, "views": 250}, now - timedelta(hours=5)),
+            ([f"{prefix}rare"], {"likes": 1}, now),
+            # Metrics that aren't numbers count as 0 rather than failing the query
+            ([f"{prefix}afcon"], {"likes": "1.2K", "shares": 3}, now - timedelta(hours=6)),
+        ]
+
+        def number(value):
+            return value if isinstance(value, (int, float)) else 0
+
+        # The Python aggregation these queries replaced, skipping non-numeric metrics
+        stats = {}
+        for hashtags, metrics, collected_at in rows:
+            for tag in hashtags:
+                entry = stats.setdefault(tag.lower(), {'count': 0, 'total_engagement': 0, 'last_seen': collected_at})
+                entry['count'] += 1
+                if metrics:
+                    entry['total_engagement'] += (
+                        number(metrics.get('likes', 0)) + number(metrics.get('comments', 0)) +
+                        number(metrics.get('shares', 0)) + number(metrics.get('retweets', 0)) +
+                        number(metrics.get('views', 0)) // 100
+                    )
+                entry['last_seen'] = max(entry['last_seen'], collected_at)
+        expected = sorted(
+            (
+                (tag, entry['count'], entry['total_engagement'],
+                 entry['count'] * 10 + entry['total_engagement'] / 1000, entry['last_seen'])
+                for tag, entry in stats.items() if entry['count'] >= 2
+            ),
+            key=lambda row: row[3],
+            reverse=True
+        )
+
+        async with _postgres_session() as session:
+            session.add_all(
+                ApifyScrapedData(platform="twitter", hashtags=hashtags, metrics_json=metrics, collected_at=collected_at)
+                for hashtags, metrics, collected_at in rows
+            )
+            await session.flush()
+
+            service = HashtagDiscoveryService(session)
+            trending = await service.get_trending_from_collected_content(hours_back=24, min_occurrences=2, limit=10000)
+
+        actual = [
+            (row['hashtag'], row['count'], row['total_engagement'], row['trend_score'], row['last_seen'])
+            for row in trending if row['hashtag'].startswith(prefix)
+        ]
+        assert actual == expected
+
+    @pytest.mark.asyncio
+    async def test_engagement_metrics_for_hashtag_matches_python_aggregation(self):
+        """Test the SQL engagement sums match the Python loop they replaced"""
+        from app.models.social_media_sources import ApifyScrapedData
+        from app.services.hashtag_discovery_service import HashtagDiscoveryService
+
+        tag = f"t{uuid.uuid4().hex[:8]}"
+        now = datetime.now(timezone.utc)
+        rows = [
+            ("twitter", {"likes": 120, "comments": 30, "shares": 4, "views": 1550}),
+            ("tiktok", {"likes": 7, "views": 99}),
+            ("facebook", None),
+            # Metrics that aren't numbers count as 0 rather than failing the query
+            ("twitter", {"likes": "1.2K", "shares": 3}),
+        ]
+
+        def number(value):
+            return value if isinstance(value, (int, float)) else 0
+
+        # The Python aggregation this query replaced, skipping non-numeric metrics
+        expected = {'likes': 0, 'comments': 0, 'shares': 0, 'views': 0, 'posts_count': 0, 'platforms': set()}
+        for platform, metrics in rows:
+            expected['posts_count'] += 1
+            if metrics:
+                for name in ('likes', 'comments', 'shares', 'views'):
+                    expected[name] += number(metrics.get(name, 0))
+                expected['platforms'].add(platform)
+
+        async with _postgres_session() as session:
+            session.add_all(
+                ApifyScrapedData(platform=platform, hashtags=[tag], metrics_json=metrics, collected_at=now)
+                for platform, metrics in rows
+            )
+            await session.flush()
+
+            service = HashtagDiscoveryService(session)
+            engagement = await service.get_engagement_metrics_for_hashtag(tag)
+
+        assert {name: engagement[name] for name in ('likes', 'comments', 'shares', 'views', 'posts_count')} == {
+            name: expected[name] for name in ('likes', 'comments', 'shares', 'views', 'posts_count')
+        }
+        assert set(engagement['platforms']) == expected['platforms']
+        assert engagement['total_engagement'] == expected['likes'] + expected['comments'] + expected['shares']
+
+
 class TestMonitoringService:
     """Tests for Monitoring Service"""
 